@@ -1,7 +1,45 @@
 """Check signature params for proper documentation."""
+from __future__ import annotations as _
+
+import typing as _t
+
 from . import messages
-from ._core import docsig
-from ._main import main
 from ._version import __version__
 
-__all__ = ["__version__", "docsig", "main", "messages"]
+if _t.TYPE_CHECKING:
+    from ._core import check, docsig
+    from ._display import Result, Results
+    from ._main import main
+
+__all__ = [
+    "Result",
+    "Results",
+    "__version__",
+    "check",
+    "docsig",
+    "main",
+    "messages",
+]
+
+
+# the core of the package is only imported once it is accessed, so the
+# commandline can handle its arguments first, and only pay the cost of
+# importing what is needed for them
+def __getattr__(name: str) -> _t.Any:
+    # pylint: disable=import-outside-toplevel
+    if name in ("check", "docsig"):
+        from . import _core
+
+        return getattr(_core, name)
+
+    if name in ("Result", "Results"):
+        from . import _display
+
+        return getattr(_display, name)
+
+    if name == "main":
+        from ._main import main
+
+        return main
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
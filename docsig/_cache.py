@@ -0,0 +1,174 @@
+"""
+docsig._cache
+=============
+"""
+from __future__ import annotations as _
+
+import contextlib as _contextlib
+import hashlib as _hashlib
+import json as _json
+import os as _os
+import typing as _t
+from pathlib import Path as _Path
+
+from ._files import Buffer as _Buffer
+from ._version import __version__
+
+#: Default directory to store cache in.
+CACHE_DIR = f".{__package__}_cache"
+
+#: Default size, in bytes, of the cache before entries are evicted.
+MAX_SIZE = 64 * 1024 * 1024
+
+
+class Cache:
+    """Persistent cache of results for checked files.
+
+    Entries are keyed on the contents of a file, the version of this
+    package and the options the file was checked with, so results can
+    be reused for any file that has not changed since it was last
+    checked.
+
+    The least recently used entries are evicted once the cache grows
+    beyond its maximum size.
+
+    :param path: Directory to store cache in.
+    :param maxsize: Maximum size of the cache, in bytes.
+    """
+
+    def __init__(
+        self, path: _Path = _Path(CACHE_DIR), maxsize: int = MAX_SIZE
+    ) -> None:
+        self._path = path
+        self._maxsize = maxsize
+
+    @property
+    def path(self) -> _Path:
+        """Directory the cache is stored in."""
+        return self._path
+
+    @staticmethod
+    def key(source: _Buffer, **kwargs: _t.Any) -> str:
+        """Get key for entry.
+
+        :param source: Contents of the file the entry belongs to.
+        :param kwargs: Options the file was checked with.
+        :return: Key to get and set entry with.
+        """
+        digest = _hashlib.sha256(__version__.encode())
+        digest.update(repr(sorted(kwargs.items())).encode())
+        digest.update(source)
+        return digest.hexdigest()
+
+    def get(
+        self, key: str, load: _t.Callable[[_t.Any], _t.Any] | None = None
+    ) -> _t.Any | None:
+        """Get an entry from the cache.
+
+        Entries are only ever decoded as JSON, so the cache cannot run
+        any code, and an entry which cannot be read, or loaded, is
+        treated as if it does not exist.
+
+        :param key: Key of the entry.
+        :param load: Callable to load the decoded entry with.
+        :return: Value of the entry if it exists, else None.
+        """
+        path = self._path / key
+        try:
+            value = _json.loads(path.read_bytes())
+            if load is not None:
+                value = load(value)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return None
+
+        # mark entry as recently used
+        with _contextlib.suppress(OSError):
+            _os.utime(path)
+
+        return value
+
+    def set(self, key: str, value: _t.Any) -> None:
+        """Add an entry to the cache.
+
+        An entry which cannot be written is not added, as results are
+        still correct without it.
+
+        :param key: Key of the entry.
+        :param value: Value of the entry, which can be encoded to JSON.
+        """
+        # only needed once there are results to write
+        import tempfile  # pylint: disable=import-outside-toplevel
+
+        tmp = None
+        try:
+            if not self._path.is_dir():
+                self._path.mkdir(parents=True, exist_ok=True)
+                (self._path / ".gitignore").write_text("*\n")
+
+            # write to temporary file first so that other processes
+            # never read a partially written entry
+            fd, tmp = tempfile.mkstemp(dir=self._path, prefix=".")
+            with _os.fdopen(fd, "w", encoding="utf-8") as fout:
+                _json.dump(value, fout)
+
+            _os.replace(tmp, self._path / key)
+        except OSError:
+            if tmp is not None:
+                with _contextlib.suppress(OSError):
+                    _os.remove(tmp)
+
+    def evict(self) -> None:
+        """Remove least recently used entries beyond the maximum size."""
+        entries = []
+        size = 0
+        try:
+            with _os.scandir(self._path) as it:
+                for entry in it:
+                    if not entry.name.startswith("."):
+                        stat = entry.stat()
+                        entries.append(
+                            (stat.st_mtime, stat.st_size, entry.path)
+                        )
+                        size += stat.st_size
+
+            entries.sort()
+            for _, entry_size, path in entries:
+                if size <= self._maxsize:
+                    break
+
+                _os.remove(path)
+                size -= entry_size
+        except OSError:
+            pass
+
+
+class Fingerprints(_t.Dict[str, _t.Any]):
+    """Results of functions keyed by their fingerprint.
+
+    Results from when a file was last checked are reused for functions
+    which have not changed, and only results which are looked up are
+    kept, so functions which no longer exist are not saved again.
+
+    :param previous: Results from when the file was last checked.
+    """
+
+    def __init__(self, previous: dict[str, _t.Any] | None = None) -> None:
+        super().__init__()
+        self._previous = previous or {}
+
+    def lookup(
+        self, fingerprint: str, func: _t.Callable[[], _t.Any]
+    ) -> _t.Any:
+        """Get the result for a fingerprint, or get it from a callable.
+
+        :param fingerprint: Fingerprint of the function.
+        :param func: Callable to get the result with if not found.
+        :return: Result for the fingerprint.
+        """
+        if fingerprint in self._previous:
+            value = self._previous[fingerprint]
+        else:
+            value = func()
+
+        self[fingerprint] = value
+        return value
@@ -6,8 +6,10 @@ from argparse import HelpFormatter as _HelpFormatter
 from pathlib import Path as _Path
 
 from arcon import ArgumentParser as _ArgumentParser
+from object_colors import Color as _Color
 
-from ._display import color as _color
+from ._utils import FORMATS as _FORMATS
+from ._utils import STYLES as _STYLES
 from ._version import __version__
 
 
@@ -17,7 +19,7 @@ class Parser(_ArgumentParser):
     def __init__(self) -> None:
         super().__init__(
             version=__version__,
-            prog=_color.cyan.get(__package__),
+            prog=_Color(fore="cyan").get(__package__),
             formatter_class=lambda prog: _HelpFormatter(
                 prog, max_help_position=45
             ),
@@ -25,11 +27,19 @@ class Parser(_ArgumentParser):
         )
         self._add_arguments()
         self.args = self.parse_args()
+        if not self.args.path and not (self.args.daemon or self.args.lsp):
+            self.error("the following arguments are required: path")
+
+        if self.args.client and (self.args.watch or self.args.daemon):
+            self.error("--client cannot be used with --watch or --daemon")
+
+        if self.args.jobs < 0:
+            self.error("argument -j/--jobs: must be 0 or more")
 
     def _add_arguments(self) -> None:
         self.add_argument(
             "path",
-            nargs="+",
+            nargs="*",
             action="store",
             type=_Path,
             help="directories or files to check",
@@ -98,6 +108,86 @@ class Parser(_ArgumentParser):
             metavar="STR",
             help="string to parse instead of files",
         )
+        self.add_argument(
+            "-j",
+            "--jobs",
+            action="store",
+            type=int,
+            default=1,
+            metavar="INT",
+            help="number of processes to use, 0 for all available cores",
+        )
+        self.add_argument(
+            "-N",
+            "--no-cache",
+            action="store_true",
+            help="do not read or write cached results",
+        )
+        self.add_argument(
+            "-y",
+            "--docstring-style",
+            action="store",
+            choices=_STYLES,
+            metavar="STR",
+            help="sphinx, google or numpy, detected if not set",
+        )
+        self.add_argument(
+            "-r",
+            "--diff",
+            action="store",
+            metavar="REF",
+            help="only check functions changed since git reference",
+        )
+        self.add_argument(
+            "-f",
+            "--format",
+            action="store",
+            choices=_FORMATS,
+            metavar="STR",
+            help="jsonl, json or sarif, report if not set",
+        )
+        self.add_argument(
+            "-w",
+            "--watch",
+            action="store_true",
+            help="check files again whenever they change",
+        )
+        self.add_argument(
+            "-z",
+            "--daemon",
+            action="store_true",
+            help="check files for clients until interrupted",
+        )
+        self.add_argument(
+            "-Z",
+            "--client",
+            action="store_true",
+            help="check files with a running daemon",
+        )
+        self.add_argument(
+            "-l",
+            "--lsp",
+            action="store_true",
+            help="run language server over stdin and stdout",
+        )
+        self.add_argument(
+            "-g",
+            "--gitignore",
+            action="store_true",
+            help="do not check files ignored by git",
+        )
+        self.add_list_argument(
+            "-e",
+            "--exclude",
+            metavar="LIST",
+            help="comma separated list of globs to exclude",
+        )
+        self.add_list_argument(
+            "-I",
+            "--include",
+            metavar="LIST",
+            help="comma separated list of globs to include",
+        )
         self.add_list_argument(
             "-d",
             "--disable",
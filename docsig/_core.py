@@ -4,18 +4,41 @@ docsig._core
 """
 from __future__ import annotations as _
 
+import itertools as _itertools
+import os as _os
 import sys as _sys
+import typing as _t
+from functools import partial as _partial
 from os import environ as _e
 from pathlib import Path as _Path
 
+from ._cache import Cache as _Cache
+from ._cache import Fingerprints as _Fingerprints
 from ._display import Display as _Display
 from ._display import Failure as _Failure
 from ._display import Failures as _Failures
-from ._display import FuncStr as _FuncStr
+from ._display import Result as _Result
+from ._display import Results as _Results
 from ._display import color as _color
+from ._files import Buffer as _Buffer
+from ._files import Files as _Files
+from ._files import decode as _decode
+from ._files import prefetch as _prefetch
+from ._files import read as _read
+from ._function import Function as _Function
+from ._git import Changes as _Changes
+from ._git import Lines as _Lines
+from ._git import changed_files as _changed_files
+from ._git import changes as _changes
 from ._module import Modules as _Modules
 from ._module import Parent as _Parent
+from ._module import _Module
 from ._report import generate_report as _generate_report
+from ._watch import watch as _watch
+
+# number of chunks to split files into for each worker process, so that
+# work is balanced while limiting the overhead of sending each file
+_CHUNKS = 4
 
 
 def pretty_print_error() -> None:
@@ -26,6 +49,29 @@ def pretty_print_error() -> None:
         )
 
 
+def _changed(func: _Function, lines: _Lines | None) -> bool:
+    # all functions are changed unless only changed lines are checked
+    return lines is None or any(
+        func.lineno <= end and start <= func.end_lineno for start, end in lines
+    )
+
+
+def _check_function(
+    func: _Function,
+    check_property_returns: bool,
+    ignore_no_params: bool,
+    no_ansi: bool,
+    targets: list[str],
+) -> _Failure | None:
+    if ignore_no_params and func.docstring.bare:
+        return None
+
+    report = _generate_report(
+        func, targets, func.disabled, check_property_returns
+    )
+    return _Failure.from_function(func, report, no_ansi) if report else None
+
+
 def _run_check(  # pylint: disable=too-many-arguments
     parent: _Parent,
     check_class: bool,
@@ -36,26 +82,327 @@ def _run_check(  # pylint: disable=too-many-arguments
     ignore_no_params: bool,
     no_ansi: bool,
     targets: list[str],
+    lines: _Lines | None,
+    fingerprints: _Fingerprints | None,
 ) -> _Failures:
     failures = _Failures()
     for func in parent:
-        if not (func.isoverridden and not check_overridden) and (
-            not (func.isprotected and not check_protected)
+        if (
+            _changed(func, lines)
+            and not (func.isoverridden and not check_overridden)
+            and not (func.isprotected and not check_protected)
             and not (func.isinit and not check_class)
             and not (func.isdunder and not check_dunders)
-            and not (func.docstring.bare and ignore_no_params)
         ):
-            report = _generate_report(
-                func, targets, func.disabled, check_property_returns
+            check = _partial(
+                _check_function,
+                func,
+                check_property_returns,
+                ignore_no_params,
+                no_ansi,
+                targets,
             )
-            if report:
-                failures.append(
-                    _Failure(func, _FuncStr(func, no_ansi), report)
-                )
+            failure = (
+                check()
+                if fingerprints is None
+                else fingerprints.lookup(func.fingerprint, check)
+            )
+            if failure is not None:
+                # the function may have moved since it was last checked
+                failures.append(failure._replace(lineno=func.lineno))
 
     return failures
 
 
+def _check_module(  # pylint: disable=too-many-arguments
+    module: _Module,
+    check_class: bool,
+    check_dunders: bool,
+    check_overridden: bool,
+    check_protected: bool,
+    check_property_returns: bool,
+    ignore_no_params: bool,
+    no_ansi: bool,
+    targets: list[str],
+    lines: _Lines | None = None,
+    fingerprints: _Fingerprints | None = None,
+) -> list[tuple[str, _Failures]]:
+    results = []
+    for top_level in module:
+        if not top_level.isprotected or check_protected:
+            failures = _run_check(
+                top_level,
+                check_class,
+                check_dunders,
+                check_overridden,
+                check_protected,
+                check_property_returns,
+                ignore_no_params,
+                no_ansi,
+                targets,
+                lines,
+                fingerprints,
+            )
+            if failures:
+                results.append((top_level.path, failures))
+
+    return results
+
+
+# results are cached as plain data, which is loaded back into failures
+def _dump_results(results: list[tuple[str, _Failures]]) -> list[_t.Any]:
+    return [[k, [i.as_json() for i in v]] for k, v in results]
+
+
+def _load_results(value: list[_t.Any]) -> list[tuple[str, _Failures]]:
+    return [(str(k), _Failures(map(_Failure.from_json, v))) for k, v in value]
+
+
+def _dump_fingerprints(fingerprints: _Fingerprints) -> dict[str, _t.Any]:
+    return {
+        k: None if v is None else v.as_json() for k, v in fingerprints.items()
+    }
+
+
+def _load_fingerprints(value: dict[str, _t.Any]) -> dict[str, _t.Any]:
+    return {
+        str(k): None if v is None else _Failure.from_json(v)
+        for k, v in value.items()
+    }
+
+
+# may run in a worker process, so only the path is sent to the worker,
+# which reads the file itself, and only the picklable failures are sent
+# back
+def _check_file(  # pylint: disable=too-many-arguments
+    path: _Path,
+    source: _Buffer | None,
+    cache: _Cache | None,
+    disable: list[str],
+    ignore_args: bool,
+    ignore_kwargs: bool,
+    docstring_style: str | None,
+    changes: _Changes | None,
+    **kwargs: _t.Any,
+) -> list[tuple[str, _Failures]]:
+    lines = None if changes is None else changes[path.resolve()]
+    if source is None:
+        source = _read(path)
+
+    key = fingerprints_key = ""
+    fingerprints = None
+    if cache is not None:
+        options = {
+            "path": str(path),
+            "disable": disable,
+            "ignore_args": ignore_args,
+            "ignore_kwargs": ignore_kwargs,
+            "docstring_style": docstring_style,
+            **kwargs,
+        }
+        key = cache.key(source, lines=lines, **options)
+        results = cache.get(key, _load_results)
+        if results is not None:
+            return results
+
+        # usually only some functions change when a file does, so the
+        # results of the others are reused
+        fingerprints_key = cache.key(b"", fingerprints=True, **options)
+        fingerprints = _Fingerprints(
+            cache.get(fingerprints_key, _load_fingerprints)
+        )
+
+    results = _check_module(
+        _Module(
+            _decode(source),
+            disable,
+            path,
+            ignore_args,
+            ignore_kwargs,
+            kwargs["check_overridden"],
+            docstring_style,
+        ),
+        lines=lines,
+        fingerprints=fingerprints,
+        **kwargs,
+    )
+    if cache is not None and fingerprints is not None:
+        cache.set(key, _dump_results(results))
+        cache.set(fingerprints_key, _dump_fingerprints(fingerprints))
+
+    return results
+
+
+def _map_files(
+    func: _t.Callable[..., list[tuple[str, _Failures]]],
+    files: _t.Iterable[_Path],
+    jobs: int,
+) -> _t.Iterator[list[tuple[str, _Failures]]]:
+    if jobs == 1:
+        # files are read while others are checked
+        yield from _itertools.starmap(func, _prefetch(files))
+    else:
+        # only import what is needed for multiprocessing when it is used
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
+
+        files = list(files)
+        workers = jobs or _os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as executor:
+            # results are yielded in the order the files were submitted
+            # in, so the report is the same as it would be if run
+            # serially
+            yield from executor.map(
+                _partial(func, source=None),
+                files,
+                chunksize=max(1, len(files) // (workers * _CHUNKS)),
+            )
+
+
+def _display_results(
+    display: _Display,
+    results: _t.Iterable[list[tuple[str, _Failures]]],
+    cache: _Cache | None,
+) -> None:
+    for result in results:
+        for key, failures in result:
+            display.add(key, failures)
+
+    display.close()
+    if cache is not None:
+        cache.evict()
+
+
+def _results(  # pylint: disable=too-many-arguments
+    *path: _Path,
+    string: str | None,
+    cache: _Cache | None,
+    disable: list[str],
+    ignore_args: bool,
+    ignore_kwargs: bool,
+    docstring_style: str | None,
+    jobs: int,
+    diff: str | None,
+    files: _Files,
+    **kwargs: _t.Any,
+) -> _t.Iterable[list[tuple[str, _Failures]]]:
+    if string is not None:
+        return (
+            _check_module(module, **kwargs)
+            for module in _Modules(
+                disable=disable,
+                string=string,
+                ignore_args=ignore_args,
+                ignore_kwargs=ignore_kwargs,
+                check_overridden=kwargs["check_overridden"],
+                docstring_style=docstring_style,
+            )
+        )
+
+    changes = None if diff is None else _changes(diff)
+    return _map_files(
+        _partial(
+            _check_file,
+            cache=cache,
+            disable=disable,
+            ignore_args=ignore_args,
+            ignore_kwargs=ignore_kwargs,
+            docstring_style=docstring_style,
+            changes=changes,
+            **kwargs,
+        ),
+        (
+            files.find(*path)
+            if changes is None
+            else filter(files.accepts, _changed_files(changes, *path))
+        ),
+        jobs,
+    )
+
+
+def check(  # pylint: disable=too-many-arguments
+    *path: _Path,
+    string: str | None = None,
+    check_class: bool = False,
+    check_dunders: bool = False,
+    check_overridden: bool = False,
+    check_protected: bool = False,
+    check_property_returns: bool = False,
+    ignore_no_params: bool = False,
+    ignore_args: bool = False,
+    ignore_kwargs: bool = False,
+    targets: list[str] | None = None,
+    disable: list[str] | None = None,
+    jobs: int = 1,
+    no_cache: bool = False,
+    docstring_style: str | None = None,
+    diff: str | None = None,
+    exclude: list[str] | None = None,
+    include: list[str] | None = None,
+    gitignore: bool = False,
+) -> _Results:
+    """Check functions, and get the results of those which failed.
+
+    The results are the same as those ``docsig`` reports, in the same
+    order, but nothing is printed.
+
+    :param path: Path(s) to check.
+    :param string: String to check.
+    :param check_class: Check class docstrings.
+    :param check_dunders: Check dunder methods
+    :param check_overridden: Check overridden methods
+    :param check_protected: Check protected functions and classes.
+    :param check_property_returns: Run return checks on properties.
+    :param ignore_no_params: Ignore docstrings where parameters are not
+        documented
+    :param ignore_args: Ignore args prefixed with an asterisk.
+    :param ignore_kwargs: Ignore kwargs prefixed with two asterisks.
+    :param targets: List of errors to target.
+    :param disable: List of errors to disable.
+    :param jobs: Number of processes to check files with, 0 to use all
+        available cores.
+    :param no_cache: Do not read or write cached results.
+    :param docstring_style: Style of docstrings to check, detected for
+        each docstring if None.
+    :param diff: Only check functions changed since this git reference.
+    :param exclude: Globs of files, and directories, not to check.
+    :param include: Globs of files to check, Python files if None.
+    :param gitignore: Do not check files ignored by git.
+    :return: Results of functions which failed their checks.
+    """
+    cache = None if no_cache else _Cache()
+    results = _Results(
+        _Result.from_failure(key, failure)
+        for result in _results(
+            *path,
+            string=string,
+            cache=cache,
+            disable=disable or [],
+            ignore_args=ignore_args,
+            ignore_kwargs=ignore_kwargs,
+            docstring_style=docstring_style,
+            jobs=jobs,
+            diff=diff,
+            files=_Files(exclude, include, gitignore),
+            check_class=check_class,
+            check_dunders=check_dunders,
+            check_overridden=check_overridden,
+            check_protected=check_protected,
+            check_property_returns=check_property_returns,
+            ignore_no_params=ignore_no_params,
+            # functions are not displayed
+            no_ansi=True,
+            targets=targets or [],
+        )
+        for key, failures in result
+        for failure in failures
+    )
+    if cache is not None:
+        cache.evict()
+
+    return results
+
+
 def docsig(  # pylint: disable=too-many-locals
     *path: _Path,
     string: str | None = None,
@@ -71,15 +418,39 @@ def docsig(  # pylint: disable=too-many-locals
     summary: bool = False,
     targets: list[str] | None = None,
     disable: list[str] | None = None,
+    jobs: int = 1,
+    no_cache: bool = False,
+    docstring_style: str | None = None,
+    diff: str | None = None,
+    watch: bool = False,
+    output_format: str | None = None,
+    exclude: list[str] | None = None,
+    include: list[str] | None = None,
+    gitignore: bool = False,
 ) -> int:
     """Package's core functionality.
 
-    Populate a sequence of module objects before iterating over their
-    top-level functions and classes.
+    Parse each module in turn before iterating over its top-level
+    functions and classes.
 
     If any of the functions within the module - and methods within its
     classes - fail, print the resulting function string representation
-    and report.
+    and report as soon as it is found.
+
+    Files can be checked across multiple processes, in which case the
+    results are collected in the same order as they would be for a
+    single process.
+
+    Results for files are cached, and files which have not changed
+    since they were last checked with the same options are not parsed
+    again.
+
+    If a git reference is provided, only files changed since that
+    reference are collected, and only the functions within them which
+    have changed are checked.
+
+    If watching, files are checked again as they change, and the exit
+    status is that of the last check.
 
     :param path: Path(s) to check.
     :param string: String to check.
@@ -96,36 +467,76 @@ def docsig(  # pylint: disable=too-many-locals
     :param summary: Print a summarised report.
     :param targets: List of errors to target.
     :param disable: List of errors to disable.
+    :param jobs: Number of processes to check files with, 0 to use all
+        available cores.
+    :param no_cache: Do not read or write cached results.
+    :param docstring_style: Style of docstrings to check, detected for
+        each docstring if None.
+    :param diff: Only check functions changed since this git reference.
+    :param watch: Check files again whenever they change, until
+        interrupted.
+    :param output_format: Format to write failures in as they are found,
+        instead of the report.
+    :param exclude: Globs of files, and directories, not to check.
+    :param include: Globs of files to check, Python files if None.
+    :param gitignore: Do not check files ignored by git.
     :return: Exit status for whether test failed or not.
     """
-    modules = _Modules(
-        *path,
-        disable=disable or [],
-        string=string,
-        ignore_args=ignore_args,
-        ignore_kwargs=ignore_kwargs,
+    options = {
+        "check_class": check_class,
+        "check_dunders": check_dunders,
+        "check_overridden": check_overridden,
+        "check_protected": check_protected,
+        "check_property_returns": check_property_returns,
+        "ignore_no_params": ignore_no_params,
+        "no_ansi": no_ansi,
+        "targets": targets or [],
+    }
+    display = _Display(no_ansi, summary, output_format)
+    cache = None if no_cache else _Cache()
+    files = _Files(exclude, include, gitignore)
+    _display_results(
+        display,
+        _results(
+            *path,
+            string=string,
+            cache=cache,
+            disable=disable or [],
+            ignore_args=ignore_args,
+            ignore_kwargs=ignore_kwargs,
+            docstring_style=docstring_style,
+            jobs=jobs,
+            diff=diff,
+            files=files,
+            **options,
+        ),
+        cache,
     )
-    display = _Display(no_ansi)
-    for module in modules:
-        for top_level in module:
-            if not top_level.isprotected or check_protected:
-                failures = _run_check(
-                    top_level,
-                    check_class,
-                    check_dunders,
-                    check_overridden,
-                    check_protected,
-                    check_property_returns,
-                    ignore_no_params,
-                    no_ansi,
-                    targets or [],
-                )
-                if failures:
-                    display[top_level.path].append(failures)
+    if watch and string is None:
+        check = _partial(
+            _check_file,
+            cache=cache,
+            disable=disable or [],
+            ignore_args=ignore_args,
+            ignore_kwargs=ignore_kwargs,
+            docstring_style=docstring_style,
+            **options,
+        )
+        try:
+            for changed in _watch(*path, files=files):
+                # only the files which changed are checked again, and
+                # their results are reported as a new run
+                display = _Display(no_ansi, summary, output_format)
+                changes = None if diff is None else _changes(diff)
+                if changes is not None:
+                    changed = [i for i in changed if i.resolve() in changes]
 
-    if summary:
-        display.summarise()
-    else:
-        display.report()
+                _display_results(
+                    display,
+                    _map_files(_partial(check, changes=changes), changed, 1),
+                    cache,
+                )
+        except KeyboardInterrupt:
+            pass
 
     return int(bool(display))
@@ -4,6 +4,7 @@ docsig._disable
 """
 from __future__ import annotations as _
 
+import bisect as _bisect
 import re as _re
 import tokenize as _tokenize
 import typing as _t
@@ -18,6 +19,30 @@ ERRORS = tuple(
 )
 
 
+class RuleSet(_t.FrozenSet[str]):
+    """Set of rules, such as the errors disabled for a function.
+
+    Sets are immutable, so they can be shared between functions, and
+    hashed, without being copied.
+    """
+
+    def disable(self, rules: _t.Iterable[str]) -> RuleSet:
+        """Get these rules with others added.
+
+        :param rules: Rules to add.
+        :return: New set of rules.
+        """
+        return RuleSet(self.union(rules))
+
+    def enable(self, rules: _t.Iterable[str]) -> RuleSet:
+        """Get these rules with others removed.
+
+        :param rules: Rules to remove.
+        :return: New set of rules.
+        """
+        return RuleSet(self.difference(rules))
+
+
 class _Rules(_t.List[str]):
     def __init__(self, kind: str) -> None:
         super().__init__()
@@ -110,26 +135,42 @@ class Directive:
         return None
 
 
-class Directives(_t.Dict[int, _t.Tuple[_t.List[Directive], _t.List[str]]]):
+class Directives:
     """Data for directives:
 
-    Dict like object with the line number of directive as the key and
-    total errors which are excluded from function checks.
+    Directives, and total errors which are excluded from function
+    checks, for the definition on each line.
+
+    Only the lines where module directives change, and lines with
+    directives of their own, are stored, so lines are looked up between
+    them. Code without any directives is not tokenized.
 
     :param text: Python code.
     :param disable: List of checks to disable.
     """
 
     def __init__(self, text: str, disable: list[str]) -> None:
-        super().__init__()
-        fin = _StringIO(text)
-        module_disables = list(disable)
+        # lines from which each change of module directives applies, in
+        # the order they were changed
+        self._lines = [0]
+        self._module: list[tuple[list[Directive], RuleSet]] = [
+            ([], RuleSet(disable))
+        ]
+        self._inline: dict[int, tuple[list[Directive], RuleSet]] = {}
+        # most code has no directives, so does not need tokenizing
+        if f"{__package__}:" not in text:
+            return
+
+        module_disables = RuleSet(disable)
         module_directives: list[Directive] = []
         directive = None
-        for line in _tokenize.generate_tokens(fin.readline):
+        lineno = 0
+        for line in _tokenize.generate_tokens(_StringIO(text).readline):
             if line.type in (_tokenize.NAME, _tokenize.OP, _tokenize.DEDENT):
                 continue
 
+            # line of the previous token which was not skipped
+            current = lineno
             lineno, col = line.start
             if line.type == _tokenize.COMMENT:
                 # ensure previous directive as backup assignment because
@@ -141,19 +182,28 @@ class Directives(_t.Dict[int, _t.Tuple[_t.List[Directive], _t.List[str]]]):
                     update = module_disables
                     if directive.isvalid:
                         if directive.disable:
-                            update = directive.rules + module_disables
+                            update = module_disables.disable(directive.rules)
                         elif directive.enable:
-                            update = [
-                                i
-                                for i in module_disables
-                                if i not in directive.rules
-                            ]
+                            update = module_disables.enable(directive.rules)
 
                     if directive.ismodule:
                         module_disables = update
                         module_directives = update_directives
+                        # a line already looked up keeps the directives
+                        # from before the change
+                        self._lines.append(lineno + (current == lineno))
+                        self._module.append((update_directives, update))
                     else:
-                        self[lineno] = update_directives, update
+                        self._inline[lineno] = update_directives, update
+
+    def get(self, lineno: int) -> tuple[list[Directive], RuleSet]:
+        """Get directives, and disabled errors, of the definition on line.
 
-            if lineno not in self:
-                self[lineno] = list(module_directives), list(module_disables)
+        :param lineno: Line number of the definition.
+        :return: Tuple of directives and disabled errors.
+        """
+        directives, disabled = (
+            self._inline.get(lineno)
+            or self._module[_bisect.bisect_right(self._lines, lineno) - 1]
+        )
+        return list(directives), disabled
@@ -4,23 +4,25 @@ docsig._display
 """
 from __future__ import annotations as _
 
+import functools as _functools
+import json as _json
+import sys as _sys
 import typing as _t
 from collections import UserString as _UserString
+from pathlib import Path as _Path
 
 from object_colors import Color as _Color
-from pygments import highlight as _highlight
-from pygments.formatters.terminal256 import (
-    Terminal256Formatter as _Terminal256Formatter,
-)
-
-# noinspection PyUnresolvedReferences
-from pygments.lexers.python import PythonLexer as _PythonLexer
 
+from . import messages as _messages
 from ._function import ARG as _ARG
 from ._function import KEY as _KEY
 from ._function import Function as _Function
 from ._function import Param as _Param
 from ._report import Report as _Report
+from ._utils import JSON as _JSON
+from ._utils import JSONL as _JSONL
+from ._utils import SARIF as _SARIF
+from ._version import __version__
 
 color = _Color()
 
@@ -28,11 +30,66 @@ color.populate_colors()
 
 TAB = "    "
 
+#: Maximum number of highlighted fragments of code to keep.
+HIGHLIGHT_CACHE_SIZE = 1024
+
+_SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+_SARIF_VERSION = "2.1.0"
+_URL = "https://github.com/jshwi/docsig"
+
+# any name is highlighted the same, so declarations are highlighted with
+# this in place of their name
+_NAME = "name"
+
+
+@_functools.lru_cache(maxsize=None)
+def _pygments() -> tuple[_t.Any, _t.Any, _t.Any]:
+    # ``pygments`` is slow to import, and not needed if there is nothing
+    # to highlight
+    # pylint: disable=import-outside-toplevel
+    from pygments import highlight
+    from pygments.formatters.terminal256 import Terminal256Formatter
+
+    # noinspection PyUnresolvedReferences
+    from pygments.lexers.python import PythonLexer
+
+    return highlight, PythonLexer(), Terminal256Formatter(style="monokai")
+
+
+# functions are rendered from the same few fragments of code, so each is
+# only highlighted once
+@_functools.lru_cache(maxsize=HIGHLIGHT_CACHE_SIZE)
+def _highlight(string: str) -> str:
+    highlight, lexer, formatter = _pygments()
+    return highlight(string, lexer, formatter).strip()
+
+
+# only a few strings are colored, such as marks
+@_functools.lru_cache(maxsize=HIGHLIGHT_CACHE_SIZE)
+def _color(string: str, color_obj: _Color) -> str:
+    return color_obj.get(string)
+
+
+def _optional(value: _t.Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def _param(value: list[_t.Any]) -> _Param:
+    kind, name, description, indent = value
+    return _Param(
+        str(kind), _optional(name), _optional(description), int(indent)
+    )
+
 
 class _ANSI:
     def __init__(self, no_ansi: bool = False) -> None:
         self._no_ansi = no_ansi
 
+    @property
+    def no_ansi(self) -> bool:
+        """Boolean value for whether ANSI output is disabled."""
+        return self._no_ansi
+
     def color(self, obj: _t.Any, color_obj: _Color) -> str:
         """Get string with selected color.
 
@@ -40,7 +97,7 @@ class _ANSI:
         :param color_obj: Instantiated ``Color`` object.
         :return: Colored string or string as was supplied.
         """
-        return str(obj) if self._no_ansi else color_obj.get(obj)
+        return str(obj) if self._no_ansi else _color(str(obj), color_obj)
 
     def syntax(self, obj: _t.Any) -> str:
         """Get code representation with syntax highlighting.
@@ -48,13 +105,20 @@ class _ANSI:
         :param obj: Any object, represented as ``__str__``.
         :return: Colored string or string as was supplied.
         """
-        return (
-            str(obj)
-            if self._no_ansi
-            else _highlight(
-                obj, _PythonLexer(), _Terminal256Formatter(style="monokai")
-            ).strip()
-        )
+        return str(obj) if self._no_ansi else _highlight(str(obj))
+
+    def declaration(self, keyword: str, name: str, end: str) -> str:
+        """Get declaration with syntax highlighting.
+
+        :param keyword: Keyword the declaration starts with.
+        :param name: Name being declared.
+        :param end: Code the declaration ends with.
+        :return: Colored string or string as was supplied.
+        """
+        if self._no_ansi:
+            return f"{keyword} {name}{end}"
+
+        return _highlight(f"{keyword} {_NAME}{end}").replace(_NAME, name)
 
 
 class FuncStr(_UserString):
@@ -70,41 +134,118 @@ class FuncStr(_UserString):
     TRIPLE_QUOTES = '"""'
 
     def __init__(self, func: _Function, no_ansi: bool = False) -> None:
-        super().__init__(func.name)
+        # pylint: disable=super-init-not-called
+        # only what is needed to render the function is kept, so that it
+        # can be sent between processes, and it is not rendered until it
+        # is needed, as it might not be displayed at all
+        self._data: str | None = None
         self._ansi = _ANSI(no_ansi)
+        self._name = func.name
         self._parent_name = func.parent.name
         self._isinit = func.isinit
-        self.data = ""
         self._is_string = func.docstring.string is not None
+        self._params = [
+            (func.signature.args.get(i), func.docstring.args.get(i))
+            for i in range(len(func))
+        ]
+        self._sig_returns = func.signature.returns
+        self._doc_returns = func.docstring.returns
+        self._rettype = func.signature.rettype
+
+    @property  # type: ignore
+    def data(self) -> str:  # type: ignore
+        """Rendered function."""
+        if self._data is None:
+            self._data = ""
+            self._render()
+
+        return self._data
+
+    @data.setter
+    def data(self, value: str) -> None:
+        """Set rendered function.
+
+        :param value: Rendered function.
+        """
+        self._data = value
+
+    def __getnewargs__(self) -> tuple[()]:  # type: ignore
+        # rendering is deferred when pickled, as everything needed to
+        # render is held in the instance's state
+        return ()
+
+    def as_json(self) -> dict[str, _t.Any]:
+        """Get what is needed to render as an object for JSON.
+
+        :return: Function as plain data.
+        """
+        return {
+            "no_ansi": self._ansi.no_ansi,
+            "name": self._name,
+            "parent_name": self._parent_name,
+            "isinit": self._isinit,
+            "is_string": self._is_string,
+            "params": [[list(i) for i in p] for p in self._params],
+            "sig_returns": self._sig_returns,
+            "doc_returns": self._doc_returns,
+            "rettype": self._rettype,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, _t.Any]) -> FuncStr:
+        """Construct function from an object decoded from JSON.
+
+        Values are converted to the types they are rendered as, so an
+        object which is not valid raises an error.
+
+        :param data: Function as returned by ``as_json``.
+        :return: Instantiated function object.
+        """
+        func_str = cls.__new__(cls)
+        func_str.__dict__.update(
+            _data=None,
+            _ansi=_ANSI(bool(data["no_ansi"])),
+            _name=str(data["name"]),
+            _parent_name=_optional(data["parent_name"]),
+            _isinit=bool(data["isinit"]),
+            _is_string=bool(data["is_string"]),
+            _params=[
+                (_param(sig), _param(doc)) for sig, doc in data["params"]
+            ],
+            _sig_returns=bool(data["sig_returns"]),
+            _doc_returns=bool(data["doc_returns"]),
+            _rettype=_optional(data["rettype"]),
+        )
+        return func_str
+
+    def _render(self) -> None:
         if self._isinit:
             self.data += TAB
 
-        self.data += self._ansi.syntax(f"def {func.name}(")
+        self.data += self._ansi.declaration("def", self._name, "(")
         if self._is_string:
             self._docstring = self._ansi.syntax(f"{TAB}{self.TRIPLE_QUOTES}")
         else:
             self._docstring = f"{TAB}{self._ansi.color('...', color.red)}\n"
 
         self._mark = self._ansi.color(self.CHECK, color.green)
-        for index in range(len(func)):
-            arg = func.signature.args.get(index)
-            doc = func.docstring.args.get(index)
+        for index, (arg, doc) in enumerate(self._params):
             self.add_param(arg, doc, arg != doc)
-            if index + 1 != len(func):
+            if index + 1 != len(self._params):
                 self.add_comma()
 
         self.set_mark()
-        if func.docstring.returns and func.signature.returns:
+        if self._doc_returns and self._sig_returns:
             self.add_return()
         elif (
-            func.docstring.returns
-            and not func.signature.returns
-            or func.signature.returns
-            and not func.docstring.returns
+            self._doc_returns
+            and not self._sig_returns
+            or self._sig_returns
+            and not self._doc_returns
         ):
             self.add_return(failed=True)
 
-        self.close_sig(func.signature.rettype)
+        self.close_sig(self._rettype)
         self.close_docstring()
         self.render()
 
@@ -188,7 +329,7 @@ class FuncStr(_UserString):
         """Render final string by adding docstring to function."""
         if self._isinit:
             self.data = (
-                self._ansi.syntax(f"class {self._parent_name}:")
+                self._ansi.declaration("class", self._parent_name, ":")
                 + f"\n{self._docstring}"
                 + f"\n{self.data}\n"
             )
@@ -197,63 +338,314 @@ class FuncStr(_UserString):
 
 
 class Failure(_t.NamedTuple):
-    """Failed function data."""
+    """Failed function data.
 
-    func: _Function
+    Only plain data is held so that failures can be sent between
+    processes.
+    """
+
+    lineno: int
+    name: str
+    parent_name: str | None
     func_str: FuncStr
     report: _Report
 
+    @classmethod
+    def from_function(
+        cls, func: _Function, report: _Report, no_ansi: bool = False
+    ) -> Failure:
+        """Construct failure from a function and its report.
+
+        :param func: Represents a function with signature and docstring
+            parameters.
+        :param report: Report compiled for the function.
+        :param no_ansi: Disable ANSI output.
+        :return: Instantiated failure object.
+        """
+        return cls(
+            func.lineno,
+            func.name,
+            func.parent.name,
+            FuncStr(func, no_ansi),
+            report,
+        )
+
+    def as_json(self) -> dict[str, _t.Any]:
+        """Get failure as an object which can be encoded to JSON.
+
+        :return: Failure as plain data.
+        """
+        return {
+            "lineno": self.lineno,
+            "name": self.name,
+            "parent_name": self.parent_name,
+            "func_str": self.func_str.as_json(),
+            "report": list(self.report),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, _t.Any]) -> Failure:
+        """Construct failure from an object decoded from JSON.
+
+        :param data: Failure as returned by ``as_json``.
+        :return: Instantiated failure object.
+        """
+        return cls(
+            int(data["lineno"]),
+            str(data["name"]),
+            _optional(data["parent_name"]),
+            FuncStr.from_json(data["func_str"]),
+            _Report.from_messages([str(i) for i in data["report"]]),
+        )
+
 
 class Failures(_t.List[Failure]):
     """Sequence of failed functions."""
 
 
-class _DisplaySequence(_t.Dict[str, _t.List[Failures]]):
-    def __getitem__(self, key: str) -> list[Failures]:
-        if key not in super().__iter__():
-            super().__setitem__(key, [])
+class Result(_t.NamedTuple):
+    """Result for a function which failed its checks.
 
-        return super().__getitem__(key)
+    The path is None if a string was checked, and the parent name is
+    None if the function does not belong to a class.
 
+    Each code is that of an error in the messages, which may also
+    include hints for the error before them.
+    """
+
+    path: _Path | None
+    lineno: int
+    parent_name: str | None
+    name: str
+    codes: tuple[str, ...]
+    messages: tuple[str, ...]
+
+    @classmethod
+    def from_failure(cls, key: str, failure: Failure) -> Result:
+        """Construct result from a failure.
+
+        :param key: Path the failure belongs to.
+        :param failure: Failed function data.
+        :return: Instantiated result object.
+        """
+        return cls(
+            _Path(key[:-1]) if key else None,
+            failure.lineno,
+            failure.parent_name or None,
+            failure.name,
+            tuple(
+                i.split(":", 1)[0] for i in failure.report if i.startswith("E")
+            ),
+            tuple(failure.report),
+        )
+
+    @property
+    def errors(self) -> list[tuple[str, str]]:
+        """Code and message of each error, with any hints that follow."""
+        errors: list[tuple[str, str]] = []
+        for message in self.messages:
+            if errors and not message.startswith("E"):
+                code, text = errors[-1]
+                errors[-1] = code, f"{text}\n{message}"
+            else:
+                code, _, text = message.partition(": ")
+                errors.append((code, text))
+
+        return errors
+
+    def as_json(self) -> dict[str, _t.Any]:
+        """Get result as an object which can be encoded to JSON.
+
+        :return: Result with its path as a string.
+        """
+        return {
+            **self._asdict(),
+            "path": None if self.path is None else self.path.as_posix(),
+        }
+
+
+class Results(_t.List[Result]):
+    """Sequence of results for functions which failed their checks."""
+
+
+class Display:
+    """Display report as failed checks are found.
 
-class Display(_DisplaySequence):
-    """Collect and display report.
+    If a format is provided, each failed function is written in that
+    format as it is found instead, without rendering it.
 
     :param no_ansi: Disable ANSI output.
+    :param summary: Print a summarised report.
+    :param output_format: Format to write instead of the report.
     """
 
-    def __init__(self, no_ansi: bool = False) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        no_ansi: bool = False,
+        summary: bool = False,
+        output_format: str | None = None,
+    ) -> None:
         self._ansi = _ANSI(no_ansi)
+        self._failed = False
+        self._format = output_format
+        self._written = 0
+        self._sarif_tail = ""
+        renderers = {_JSONL: self.jsonl, _JSON: self.json, _SARIF: self.sarif}
+        self._render = renderers.get(
+            output_format, self.summarise if summary else self.report
+        )
+
+    def __bool__(self) -> bool:
+        return self._failed
+
+    def add(self, key: str, failures: Failures) -> None:
+        """Display failures belonging to a path.
+
+        :param key: Path the failures belong to.
+        :param failures: Sequence of failed functions.
+        """
+        for failure in failures:
+            self._failed = True
+            self._render(key, failure)
+
+    def report(self, key: str, failure: Failure) -> None:
+        """Display report for a failed function.
+
+        :param key: Path the failure belongs to.
+        :param failure: Failed function data.
+        """
+        header = f"{key}{failure.lineno}"
+        if failure.parent_name:
+            header += f" in {failure.parent_name}"
+
+        print(self._ansi.color(header, color.magenta))
+        print(len(header) * "-")
+        print(failure.func_str)
+        print(failure.report.get_report())
+
+    def summarise(self, key: str, failure: Failure) -> None:
+        """Display report summary for a failed function.
+
+        :param key: Path the failure belongs to.
+        :param failure: Failed function data.
+        """
+        header = f"{key}{failure.lineno}"
+        function = failure.name
+        if failure.parent_name:
+            function = f"{failure.parent_name}.{function}"
+
+        header += f" in {function}"
+        print(
+            "{}\n\t{}".format(
+                self._ansi.color(header, color.magenta),
+                failure.report.get_report("\t").strip(),
+            )
+        )
+
+    def jsonl(self, key: str, failure: Failure) -> None:
+        """Write failed function as a line of JSON.
+
+        :param key: Path the failure belongs to.
+        :param failure: Failed function data.
+        """
+        result = Result.from_failure(key, failure)
+        _sys.stdout.write(_json.dumps(result.as_json()) + "\n")
+
+    def json(self, key: str, failure: Failure) -> None:
+        """Write failed function as an item of a JSON array.
+
+        :param key: Path the failure belongs to.
+        :param failure: Failed function data.
+        """
+        result = Result.from_failure(key, failure)
+        _sys.stdout.write(",\n" if self._written else "[\n")
+        _sys.stdout.write(_json.dumps(result.as_json()))
+        self._written += 1
+
+    def _sarif_head(self) -> None:
+        # the document is written up to its results, and the rest of it
+        # is written once all results have been written
+        document = {
+            "$schema": _SARIF_SCHEMA,
+            "version": _SARIF_VERSION,
+            "runs": [
+                {
+                    "tool": {
+                        "driver": {
+                            "name": __package__,
+                            "version": __version__,
+                            "informationUri": _URL,
+                            "rules": [
+                                {
+                                    "id": i,
+                                    "shortDescription": {
+                                        "text": getattr(_messages, i)
+                                        .split(": ", 1)[1]
+                                        .format(directive="...", option="...")
+                                    },
+                                }
+                                for i in dir(_messages)
+                                if i.startswith("E")
+                            ],
+                        }
+                    },
+                    "results": [],
+                }
+            ],
+        }
+        head, self._sarif_tail = _json.dumps(document).rsplit("[]", 1)
+        _sys.stdout.write(f"{head}[")
+
+    def sarif(self, key: str, failure: Failure) -> None:
+        """Write each error of failed function as a SARIF result.
+
+        :param key: Path the failure belongs to.
+        :param failure: Failed function data.
+        """
+        result = Result.from_failure(key, failure)
+        location: dict[str, _t.Any] = {
+            "logicalLocations": [
+                {
+                    "name": result.name,
+                    "fullyQualifiedName": (
+                        result.name
+                        if result.parent_name is None
+                        else f"{result.parent_name}.{result.name}"
+                    ),
+                    "kind": "function",
+                }
+            ]
+        }
+        if result.path is not None:
+            location["physicalLocation"] = {
+                "artifactLocation": {"uri": result.path.as_posix()},
+                "region": {"startLine": result.lineno},
+            }
+
+        for code, text in result.errors:
+            if not self._written:
+                self._sarif_head()
+            else:
+                _sys.stdout.write(", ")
+
+            _sys.stdout.write(
+                _json.dumps(
+                    {
+                        "ruleId": code,
+                        "level": "error",
+                        "message": {"text": text},
+                        "locations": [location],
+                    }
+                )
+            )
+            self._written += 1
+
+    def close(self) -> None:
+        """Finish writing the format, if it is a document."""
+        if self._format == _JSON:
+            _sys.stdout.write("\n]\n" if self._written else "[]\n")
+        elif self._format == _SARIF:
+            if not self._written:
+                self._sarif_head()
 
-    def report(self) -> None:
-        """Display report if any checks have failed."""
-        for key, value in self.items():
-            for failures in value:
-                for failure in failures:
-                    header = f"{key}{failure.func.lineno}"
-                    if failure.func.parent.name:
-                        header += f" in {failure.func.parent.name}"
-
-                    print(self._ansi.color(header, color.magenta))
-                    print(len(header) * "-")
-                    print(failure.func_str)
-                    print(failure.report.get_report())
-
-    def summarise(self) -> None:
-        """Display report summary if any checks have failed."""
-        for key, value in self.items():
-            for failures in value:
-                for failure in failures:
-                    header = f"{key}{failure.func.lineno}"
-                    function = failure.func.name
-                    if failure.func.parent.name:
-                        function = f"{failure.func.parent.name}.{function}"
-
-                    header += f" in {function}"
-                    print(
-                        "{}\n\t{}".format(
-                            self._ansi.color(header, color.magenta),
-                            failure.report.get_report("\t").strip(),
-                        )
-                    )
+            _sys.stdout.write(f"]{self._sarif_tail}\n")
@@ -0,0 +1,373 @@
+"""
+docsig._files
+=============
+
+Find files to check, without visiting directories which are excluded,
+and read them ahead of when they are checked.
+"""
+from __future__ import annotations as _
+
+import collections as _collections
+import mmap as _mmap
+import os as _os
+import re as _re
+import tokenize as _tokenize
+import typing as _t
+from pathlib import Path as _Path
+
+_GIT = ".git"
+_GITIGNORE = ".gitignore"
+
+# python files are checked unless other files are included
+_INCLUDE = ("*.py",)
+
+#: Files of at least this size, in bytes, are mapped into memory.
+MMAP_SIZE = 1024 * 1024
+
+#: Number of files read ahead of the file being checked.
+PREFETCH = 4
+
+#: Contents of a file, as read or mapped into memory.
+Buffer = _t.Union[bytes, _mmap.mmap]
+
+
+class _Rule(_t.NamedTuple):
+    # pattern of a glob, and whether it matches directories only, the
+    # path rather than the name, or excludes rather than includes
+    pattern: _t.Pattern[str]
+    directory: bool
+    anchored: bool
+    negate: bool
+
+
+# rules of a .gitignore file, and the path of the directory being walked
+# relative to the directory of the file
+_Level = _t.Tuple[_t.Tuple[_Rule, ...], str]
+
+
+def _translate(glob: str) -> _t.Pattern[str]:
+    # unlike fnmatch, only ``**`` matches across directories
+    regex = ""
+    index = 0
+    while index < len(glob):
+        char = glob[index]
+        index += 1
+        if char == "*" and glob.startswith("*/", index):
+            regex += "(?:.*/)?"
+            index += 2
+        elif char == "*" and glob.startswith("*", index):
+            regex += ".*"
+            index += 1
+        elif char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[" and "]" in glob[index + 1 :]:
+            end = glob.index("]", index + 1)
+            body = glob[index:end].replace("\\", "\\\\")
+            regex += f"[^{body[1:]}]" if body.startswith("!") else f"[{body}]"
+            index = end + 1
+        elif char == "\\" and index < len(glob):
+            regex += _re.escape(glob[index])
+            index += 1
+        else:
+            regex += _re.escape(char)
+
+    return _re.compile(f"{regex}\\Z")
+
+
+def _rule(glob: str) -> _Rule | None:
+    # parse a glob as it would be in a .gitignore file
+    glob = glob.rstrip()
+    if not glob or glob.startswith("#"):
+        return None
+
+    # a leading backslash is escaped like any other character
+    negate = glob.startswith("!")
+    if negate:
+        glob = glob[1:]
+
+    directory = glob.endswith("/")
+    glob = glob.rstrip("/")
+    # globs with a slash before their end match from where they are
+    # defined, and others match at any depth
+    anchored = "/" in glob
+    return _Rule(_translate(glob.lstrip("/")), directory, anchored, negate)
+
+
+def _rules(globs: _t.Iterable[str]) -> tuple[_Rule, ...]:
+    return tuple(i for i in map(_rule, globs) if i is not None)
+
+
+def _match(
+    rules: tuple[_Rule, ...], path: str, name: str, isdir: bool
+) -> bool | None:
+    # whether the last rule to match a path excludes it, if any match
+    result = None
+    for rule in rules:
+        if (isdir or not rule.directory) and rule.pattern.match(
+            path if rule.anchored else name
+        ):
+            result = not rule.negate
+
+    return result
+
+
+def _read(directory: _Path) -> tuple[_Rule, ...]:
+    try:
+        return _rules(
+            (directory / _GITIGNORE).read_text(encoding="utf-8").splitlines()
+        )
+    except OSError:
+        return ()
+
+
+def _toplevel(path: _Path) -> _Path | None:
+    # root of the git repository a path is in, if it is in one
+    for parent in (path, *path.parents):
+        if (parent / _GIT).exists():
+            return parent
+
+    return None
+
+
+def _descend(levels: tuple[_Level, ...], name: str) -> tuple[_Level, ...]:
+    return tuple((r, f"{p}{name}/") for r, p in levels)
+
+
+def _ignored(levels: tuple[_Level, ...], name: str, isdir: bool) -> bool:
+    # rules of .gitignore files in lower directories take precedence
+    result = None
+    for rules, prefix in levels:
+        match = _match(rules, f"{prefix}{name}", name, isdir)
+        if match is not None:
+            result = match
+
+    return bool(result)
+
+
+class Files:
+    """Find files to check within paths.
+
+    A file is checked if it matches a glob to include, and neither it,
+    nor any directory it is within, matches a glob to exclude, or is
+    ignored by git. Excluded directories are not walked.
+
+    Globs are the same as those of ``.gitignore`` files, so those
+    without a slash match the name of any file or directory, and those
+    with one match its path.
+
+    Files are found in sorted order, so they are checked in the same
+    order on any filesystem.
+
+    :param exclude: Globs of files, and directories, to exclude.
+    :param include: Globs of files to include, Python files if None.
+    :param gitignore: Exclude files, and directories, ignored by
+        ``.gitignore`` files in the git repository they are within.
+    """
+
+    def __init__(
+        self,
+        exclude: list[str] | None = None,
+        include: list[str] | None = None,
+        gitignore: bool = False,
+    ) -> None:
+        self._exclude = _rules(exclude or ())
+        self._include = _rules(include or _INCLUDE)
+        self._gitignore = gitignore
+
+    def _excluded(self, path: _Path, isdir: bool) -> bool:
+        posix = path.as_posix()
+        if _match(self._exclude, posix, path.name, isdir):
+            return True
+
+        return not isdir and not _match(self._include, posix, path.name, False)
+
+    def _git(
+        self, path: _Path, isdir: bool
+    ) -> tuple[bool, tuple[_Level, ...] | None]:
+        # whether git ignores a path, and if not, the rules of the
+        # .gitignore files above it, or None if they do not apply
+        if not self._gitignore:
+            return False, None
+
+        resolved = path.resolve()
+        toplevel = _toplevel(resolved)
+        if toplevel is None:
+            return False, None
+
+        parts = resolved.relative_to(toplevel).parts
+        levels: tuple[_Level, ...] = ()
+        for index, part in enumerate(parts):
+            levels += ((_read(toplevel.joinpath(*parts[:index])), ""),)
+            if _ignored(levels, part, isdir or index < len(parts) - 1):
+                return True, None
+
+            levels = _descend(levels, part)
+
+        return False, levels
+
+    def _walk(
+        self, directory: _Path, levels: tuple[_Level, ...] | None
+    ) -> _t.Iterator[_Path]:
+        found = []
+        with _os.scandir(directory) as entries:
+            for entry in entries:
+                # the type of an entry is usually known without calling
+                # stat on it, and others, such as broken links, are not
+                # files to check
+                isdir = entry.is_dir()
+                if isdir or entry.is_file():
+                    found.append((entry.name, isdir))
+
+        if levels is not None and (_GITIGNORE, False) in found:
+            levels += ((_read(directory), ""),)
+
+        for name, isdir in sorted(found):
+            path = directory / name
+            if self._excluded(path, isdir) or (
+                levels is not None
+                and (name == _GIT or _ignored(levels, name, isdir))
+            ):
+                continue
+
+            if not isdir:
+                yield path
+            else:
+                yield from self._walk(
+                    path, None if levels is None else _descend(levels, name)
+                )
+
+    def _given(self, path: _Path, isdir: bool) -> bool:
+        # whether a path, or any directory it is given within, is
+        # excluded, which is not known for the parents of absolute paths
+        parents = () if path.is_absolute() else path.parents
+        return self._excluded(path, isdir) or any(
+            self._excluded(i, True) for i in parents if i.name
+        )
+
+    def accepts(self, path: _Path, isdir: bool = False) -> bool:
+        """Confirm whether a file, or directory, would be checked.
+
+        :param path: Path to file or directory.
+        :param isdir: Whether the path is to a directory.
+        :return: Boolean value for whether the path would be checked.
+        """
+        return not self._given(path, isdir) and not self._git(path, isdir)[0]
+
+    def find(self, *paths: _Path) -> _t.Iterator[_Path]:
+        """Find files to check within paths, as they are found.
+
+        :param paths: Path(s) to files, or directories to walk.
+        :return: Iterator of files to check.
+        """
+        for path in paths:
+            if not path.exists():
+                raise FileNotFoundError(path)
+
+            isdir = path.is_dir()
+            ignored, levels = self._git(path, isdir)
+            if not ignored and not self._given(path, isdir):
+                if isdir:
+                    yield from self._walk(path, levels)
+                else:
+                    yield path
+
+
+def read(path: _Path) -> Buffer:
+    """Read the contents of a file.
+
+    Large files are mapped into memory, so they are not copied before
+    they are decoded, and their pages are read in the background.
+
+    :param path: Path to file.
+    :return: Contents of the file.
+    """
+    with open(path, "rb") as fin:
+        if _os.fstat(fin.fileno()).st_size < MMAP_SIZE:
+            return fin.read()
+
+        buffer = _mmap.mmap(fin.fileno(), 0, access=_mmap.ACCESS_READ)
+
+    if hasattr(buffer, "madvise"):
+        buffer.madvise(_mmap.MADV_WILLNEED)
+
+    return buffer
+
+
+def _readline(buffer: Buffer) -> _t.Callable[[], bytes]:
+    # only the lines which are read are copied, unlike with ``BytesIO``
+    # for a memory map
+    position = 0
+
+    def readline() -> bytes:
+        nonlocal position
+        start = position
+        position = buffer.find(b"\n", start) + 1 or len(buffer)
+        return buffer[start:position]
+
+    return readline
+
+
+def decode(buffer: Buffer) -> str:
+    """Decode the contents of a Python file.
+
+    The encoding is detected from the byte order mark, or the coding
+    comment of PEP 263, as it is by Python, and newlines are translated
+    as they would be if read as text.
+
+    :param buffer: Contents of the file.
+    :return: Decoded contents.
+    """
+    encoding, _ = _tokenize.detect_encoding(_readline(buffer))
+    text = str(buffer, encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return text
+
+
+def prefetch(
+    paths: _t.Iterable[_Path], workers: int = PREFETCH
+) -> _t.Iterator[tuple[_Path, Buffer]]:
+    """Read files on a pool of threads ahead of when they are needed.
+
+    Files are yielded in the order of their paths, and no more than
+    ``workers`` are read ahead of the last file yielded, so the time
+    spent waiting for each read overlaps with checking the others.
+
+    :param paths: Paths to files.
+    :param workers: Number of threads to read files with.
+    :return: Iterator of paths and the contents of their files.
+    """
+    # only import what is needed for threads when they are used
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ThreadPoolExecutor
+
+    pending: _t.Deque[tuple[_Path, _t.Any]] = _collections.deque()
+    iterator = iter(paths)
+    with ThreadPoolExecutor(workers) as executor:
+        while True:
+            try:
+                path = next(iterator, None)
+            except Exception:
+                # errors finding files, such as for paths which do not
+                # exist, are raised once the files found before them are
+                # yielded, as they would be without reading ahead
+                while pending:
+                    ready, future = pending.popleft()
+                    yield ready, future.result()
+
+                raise
+
+            if path is None:
+                break
+
+            pending.append((path, executor.submit(read, path)))
+            if len(pending) > workers:
+                ready, future = pending.popleft()
+                yield ready, future.result()
+
+        while pending:
+            ready, future = pending.popleft()
+            yield ready, future.result()
@@ -4,15 +4,18 @@ docsig._function
 """
 from __future__ import annotations as _
 
+import functools as _functools
+import hashlib as _hashlib
 import re as _re
 import textwrap as _textwrap
 import typing as _t
 from collections import Counter as _Counter
 
-import astroid as _ast
-import sphinx.ext.napoleon as _s
-
+from . import _node
 from ._directives import Directive as _Directive
+from ._directives import RuleSet as _RuleSet
+from ._utils import GOOGLE as _GOOGLE
+from ._utils import NUMPY as _NUMPY
 from ._utils import isprotected as _isprotected
 
 PARAM = "param"
@@ -21,14 +24,69 @@ KEY = "key"
 RETURN = "return"
 ARG = "arg"
 
+#: Maximum number of converted docstrings to keep.
+DOCSTRING_CACHE_SIZE = 4096
+
+# section headers recognised by napoleon
+_SECTIONS = frozenset(
+    (
+        "args",
+        "arguments",
+        "attention",
+        "attributes",
+        "caution",
+        "danger",
+        "error",
+        "example",
+        "examples",
+        "hint",
+        "important",
+        "keyword args",
+        "keyword arguments",
+        "methods",
+        "note",
+        "notes",
+        "other parameters",
+        "parameters",
+        "receive",
+        "receives",
+        "return",
+        "returns",
+        "raise",
+        "raises",
+        "references",
+        "see also",
+        "tip",
+        "todo",
+        "warning",
+        "warnings",
+        "warn",
+        "warns",
+        "yield",
+        "yields",
+    )
+)
+_UNDERLINE = _re.compile(r"^[=\-`:'\"~^_*+#<>]{2,}\s*$")
+_INDEX = ".. index::"
+
+
+# ``sphinx`` is slow to import, and only needed for docstrings which are
+# not already in its own style, so it is imported once it is needed
+
 
 class _GoogleDocstring(str):
     def __new__(cls, string: str) -> _GoogleDocstring:
+        # pylint: disable-next=import-outside-toplevel
+        import sphinx.ext.napoleon as _s
+
         return super().__new__(cls, str(_s.GoogleDocstring(string)))
 
 
 class _NumpyDocstring(str):
     def __new__(cls, string: str) -> _NumpyDocstring:
+        # pylint: disable-next=import-outside-toplevel
+        import sphinx.ext.napoleon as _s
+
         return super().__new__(cls, str(_s.NumpyDocstring(string)))
 
 
@@ -42,11 +100,62 @@ class _DocFmt(str):
         )
 
 
+def _get_styles(string: str) -> tuple[bool, bool]:
+    # cheaply detect whether there are any ``Google`` or ``NumPy``
+    # sections which napoleon would convert, erring on the side of
+    # converting, as each conversion is only a no-op without them
+    google = numpy = False
+    lines = [i.strip().lower() for i in string.splitlines()]
+    for index, line in enumerate(lines):
+        if line.endswith(":") and line.strip(":").strip() in _SECTIONS:
+            google = True
+
+        if line.startswith(_INDEX) or (
+            line in _SECTIONS
+            and index + 1 < len(lines)
+            and _UNDERLINE.match(lines[index + 1])
+        ):
+            numpy = True
+
+    return google, numpy
+
+
+# identical docstrings are common, such as those of overridden methods
+# and generated code, so only convert each one once
+@_functools.lru_cache(maxsize=DOCSTRING_CACHE_SIZE)
+def _convert(string: str, style: str | None = None) -> str:
+    string = _DocFmt(string)
+    google, numpy = (
+        _get_styles(string)
+        if style is None
+        else (style == _GOOGLE, style == _NUMPY)
+    )
+    if google:
+        string = _GoogleDocstring(string)
+
+    if numpy:
+        string = _NumpyDocstring(string)
+
+    if not google and not numpy:
+        # napoleon strips trailing whitespace from every line, and
+        # otherwise only differs by blank lines, which are not checked
+        string = "\n".join(i.rstrip() for i in string.splitlines())
+
+    return string
+
+
+def cache_info() -> _functools._CacheInfo:
+    """Get statistics for converted docstrings.
+
+    :return: Number of hits and misses for converted docstrings, and
+        the maximum and current size of their cache.
+    """
+    return _convert.cache_info()
+
+
 class _RawDocstring(str):
-    def __new__(cls, string: str) -> _RawDocstring:
-        return super().__new__(
-            cls, _NumpyDocstring(_GoogleDocstring(_DocFmt(string)))
-        )
+    def __new__(cls, string: str, style: str | None = None) -> _RawDocstring:
+        return super().__new__(cls, _convert(string, style))
 
 
 class Param(_t.NamedTuple):
@@ -170,63 +279,35 @@ class _DocSig:
 class _Signature(_DocSig):
     def __init__(  # pylint: disable=too-many-arguments
         self,
-        arguments: _ast.Arguments,
-        returns: _ast.Module | str,
+        arguments: _node.Arguments,
+        returns: str | None,
         ismethod: bool = False,
         isstaticmethod: bool = False,
         ignore_args: bool = False,
         ignore_kwargs: bool = False,
     ) -> None:
         super().__init__(ignore_args, ignore_kwargs)
-
+        posonlyargs = list(arguments.posonlyargs)
+        args = list(arguments.args)
         if ismethod and not isstaticmethod:
-            if arguments.posonlyargs:
-                arguments.posonlyargs.pop(0)
-            elif arguments.args:
-                arguments.args.pop(0)
+            if posonlyargs:
+                posonlyargs.pop(0)
+            elif args:
+                args.pop(0)
 
         for i in [
-            a if isinstance(a, Param) else Param(name=a.name)
-            for a in [
-                *arguments.posonlyargs,
-                *arguments.args,
-                Param(ARG, name=arguments.vararg),
-                *arguments.kwonlyargs,
-                Param(KEY, name=arguments.kwarg),
-            ]
-            if a is not None and a.name
+            *[Param(name=a) for a in posonlyargs],
+            *[Param(name=a) for a in args],
+            Param(ARG, name=arguments.vararg),
+            *[Param(name=a) for a in arguments.kwonlyargs],
+            Param(KEY, name=arguments.kwarg),
         ]:
-            self.args.append(i)
+            if i.name:
+                self.args.append(i)
 
-        self._rettype = (
-            returns if isinstance(returns, str) else self._get_rettype(returns)
-        )
+        self._rettype = returns
         self._returns = str(self._rettype) != "None"
 
-    def _get_rettype(self, returns: _ast.NodeNG | None) -> str | None:
-        if isinstance(returns, _ast.Name):
-            return returns.name
-
-        if isinstance(returns, _ast.Attribute):
-            return returns.attrname
-
-        if isinstance(returns, _ast.Const):
-            return str(returns.value)
-
-        if isinstance(returns, _ast.Subscript):
-            return "{}[{}]".format(
-                self._get_rettype(returns.value),
-                self._get_rettype(returns.slice),
-            )
-
-        if isinstance(returns, _ast.BinOp):
-            return "{} | {}".format(
-                self._get_rettype(returns.left),
-                self._get_rettype(returns.right),
-            )
-
-        return None
-
     @property
     def rettype(self) -> str | None:
         """Function's return value.
@@ -240,14 +321,15 @@ class _Signature(_DocSig):
 class _Docstring(_DocSig):
     def __init__(
         self,
-        node: _ast.Const | None = None,
+        string: str | None = None,
         ignore_args: bool = False,
         ignore_kwargs: bool = False,
+        style: str | None = None,
     ) -> None:
         super().__init__(ignore_args, ignore_kwargs)
         self._string = None
-        if node is not None:
-            self._string = _RawDocstring(node.value)
+        if string is not None:
+            self._string = _RawDocstring(string, style)
             for i in _Matches(self._string):
                 self._args.append(i)
 
@@ -274,51 +356,44 @@ class Function:  # pylint: disable=too-many-arguments
 
     :param node: Function's abstract syntax tree.
     :param directives: Directive, if any, belonging to this function.
-    :param disabled: List of disabled checks specific to this function.
+    :param disabled: Set of disabled checks specific to this function.
     :param ignore_args: Ignore args prefixed with an asterisk.
     :param ignore_kwargs: Ignore kwargs prefixed with two asterisks.
+    :param docstring_style: Style of docstring, detected if None.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
-        node: _ast.FunctionDef,
+        node: _node.FunctionDef,
         directives: _t.List[_Directive],
-        disabled: list[str],
+        disabled: _RuleSet,
         ignore_args: bool = False,
         ignore_kwargs: bool = False,
+        docstring_style: str | None = None,
     ) -> None:
         self._node = node
         self._directives = directives
         self._disabled = disabled
-        self._parent = node.parent.frame()
-        self._signature = _Signature(
-            node.args,
-            node.returns,
-            self.ismethod,
-            self.isstaticmethod,
-            ignore_args,
-            ignore_kwargs,
-        )
-        self._docstring = _Docstring(
-            node.doc_node if not self.isinit else self._parent.doc_node,
-            ignore_kwargs,
-        )
+        self._parent = node.parent
+        self._rettype = node.returns
+        self._signature: _Signature | None = None
+        self._doc = node.doc if not self.isinit else self._parent.doc
+        self._ignore_args = ignore_args
+        self._ignore_kwargs = ignore_kwargs
+        self._docstring_style = docstring_style
+        self._docstring: _Docstring | None = None
 
     def __len__(self) -> int:
         """Length of the longest sequence of args."""
         return max([len(self.signature.args), len(self.docstring.args)])
 
     def _decorated_with(self, name: str) -> bool:
-        if self._node.decorators is not None:
-            for dec in self._node.decorators.nodes:
-                return isinstance(dec, _ast.Name) and dec.name == name
-
-        return False
+        return self._node.decorator == name
 
     @property
     def ismethod(self) -> bool:
         """Boolean value for whether function is a method."""
-        return isinstance(self._parent, _ast.ClassDef)
+        return isinstance(self._parent, _node.ClassDef)
 
     @property
     def isproperty(self) -> bool:
@@ -338,14 +413,11 @@ class Function:  # pylint: disable=too-many-arguments
     @property
     def isoverridden(self) -> bool:
         """Boolean value for whether function is overridden."""
-        if self.ismethod and not self.isinit:
-            for ancestor in self._parent.ancestors():
-                if self.name in ancestor and isinstance(
-                    ancestor[self.name], _ast.FunctionDef
-                ):
-                    return True
-
-        return False
+        return (
+            isinstance(self._parent, _node.ClassDef)
+            and not self.isinit
+            and self._parent.isoverridden(self.name)
+        )
 
     @property
     def isprotected(self) -> bool:
@@ -374,9 +446,7 @@ class Function:  # pylint: disable=too-many-arguments
         return self._node.name
 
     @property
-    def parent(
-        self,
-    ) -> _ast.FunctionDef | _ast.Module | _ast.ClassDef | _ast.Lambda:
+    def parent(self) -> _node.Module | _node.ClassDef:
         """Function's parent node."""
         return self._parent
 
@@ -385,19 +455,78 @@ class Function:  # pylint: disable=too-many-arguments
         """Line number of function declaration."""
         return self._node.lineno or 0
 
+    @property
+    def end_lineno(self) -> int:
+        """Line number of the end of the function."""
+        return self._node.end_lineno
+
     @property
     def signature(self) -> _Signature:
         """The function's signature parameters."""
+        # not every check needs the signature, so it is not collected
+        # unless it is checked
+        if self._signature is None:
+            self._signature = _Signature(
+                self._node.args,
+                self._rettype,
+                self.ismethod,
+                self.isstaticmethod,
+                self._ignore_args,
+                self._ignore_kwargs,
+            )
+
         return self._signature
 
+    @property
+    def doc(self) -> str | None:
+        """The function's raw docstring, if it has one."""
+        return self._doc
+
     @property
     def docstring(self) -> _Docstring:
         """The function's docstring."""
+        # converting docstrings is slow, so they are not converted
+        # unless they are checked
+        if self._docstring is None:
+            self._docstring = _Docstring(
+                self._doc, self._ignore_kwargs, style=self._docstring_style
+            )
+
         return self._docstring
 
     @property
-    def disabled(self) -> list[str]:
-        """List of disabled checks specific to this function."""
+    def fingerprint(self) -> str:
+        """Digest of everything the function is checked on.
+
+        Functions with the same fingerprint, checked with the same
+        options, have the same results, apart from their line number.
+        """
+        return _hashlib.sha256(
+            repr(
+                (
+                    self.name,
+                    self._parent.name,
+                    self.isinit,
+                    self.isdunder,
+                    self.isprotected,
+                    self.isproperty,
+                    self.isoverridden,
+                    self.isstaticmethod,
+                    self._node.args,
+                    self._rettype,
+                    self._doc,
+                    [
+                        (i.kind, i.ismodule, list(i.rules), i.rules.unknown)
+                        for i in self._directives
+                    ],
+                    sorted(self._disabled),
+                )
+            ).encode()
+        ).hexdigest()
+
+    @property
+    def disabled(self) -> _RuleSet:
+        """Set of disabled checks specific to this function."""
         return self._disabled
 
     @property
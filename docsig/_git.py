@@ -0,0 +1,94 @@
+"""
+docsig._git
+===========
+"""
+from __future__ import annotations as _
+
+import re as _re
+import subprocess as _sp
+import sys as _sys
+import typing as _t
+from pathlib import Path as _Path
+
+_HUNK = _re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+#: Ranges of lines, inclusive.
+Lines = _t.List[_t.Tuple[int, int]]
+
+#: Lines changed in each file, keyed by resolved path.
+Changes = _t.Dict[_Path, Lines]
+
+
+def _git(*args: str) -> str:
+    # errors are left to git to explain
+    return _sp.run(
+        ["git", "-c", "core.quotePath=false", *args],
+        stdout=_sp.PIPE,
+        check=True,
+        text=True,
+    ).stdout
+
+
+def changes(ref: str) -> Changes:
+    """Get lines changed since a git reference.
+
+    Changes are read from the working tree, so changes which are not
+    committed are included, and files which are not tracked are changed
+    entirely.
+
+    :param ref: Reference to compare with, such as a branch or commit.
+    :return: Lines changed in each file.
+    """
+    root = _Path(_git("rev-parse", "--show-toplevel").strip())
+    result: Changes = {}
+    lines: Lines = []
+    for line in _git(
+        "diff",
+        "--unified=0",
+        "--no-color",
+        "--no-ext-diff",
+        "--diff-filter=d",
+        # regardless of the user's config
+        "--src-prefix=a/",
+        "--dst-prefix=b/",
+        ref,
+        "--",
+    ).splitlines():
+        if line.startswith("+++ b/"):
+            lines = result.setdefault(root / line[6:], [])
+        else:
+            match = _HUNK.match(line)
+            if match is not None:
+                start = int(match.group(1))
+                count = int(match.group(2) or 1)
+                # lines which were only removed are between this line
+                # and the next
+                end = start + count - 1 if count else start + 1
+                lines.append((start, end))
+
+    for line in _git(
+        "ls-files", "--others", "--exclude-standard", "--full-name", "-z", ":/"
+    ).split("\0"):
+        if line:
+            result[root / line] = [(1, _sys.maxsize)]
+
+    return result
+
+
+def changed_files(changes: Changes, *paths: _Path) -> _t.Iterator[_Path]:
+    """Collect changed Python files from within all paths provided.
+
+    :param changes: Lines changed in each file.
+    :param paths: Path(s) to collect files from.
+    :return: Iterator of changed Python files.
+    """
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(path)
+
+        root = path.resolve()
+        for file in changes:
+            if file.name.endswith(".py") and (
+                file == root or root in file.parents
+            ):
+                yield path / file.relative_to(root)
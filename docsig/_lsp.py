@@ -0,0 +1,306 @@
+"""
+docsig._lsp
+===========
+
+Language server, so that editors can show failed checks as documents
+are edited.
+"""
+from __future__ import annotations as _
+
+import io as _io
+import json as _json
+import queue as _queue
+import threading as _threading
+import time as _time
+import typing as _t
+
+from ._cache import Fingerprints as _Fingerprints
+from ._core import _check_module
+from ._display import Failure as _Failure
+from ._display import Result as _Result
+from ._module import Modules as _Modules
+from ._version import __version__
+
+#: Seconds to wait for any other changes to a document before it is
+#: checked.
+DEBOUNCE = 0.05
+
+# object decoded from, or to be encoded to, json
+_JSONObject = _t.Dict[str, _t.Any]
+
+_SEVERITY_ERROR = 1
+_METHOD_NOT_FOUND = -32601
+_SYNC_INCREMENTAL = 2
+
+
+def _read(fin: _t.BinaryIO) -> _JSONObject | None:
+    # read headers until a blank line, followed by the content, or None
+    # if there is nothing left to read
+    length = 0
+    while True:
+        line = fin.readline()
+        if not line:
+            return None
+
+        name, _, value = line.decode("ascii").partition(":")
+        if not name.strip():
+            return _json.loads(fin.read(length))
+
+        if name.strip().lower() == "content-length":
+            length = int(value)
+
+
+def _offset(lines: list[str], position: dict[str, int]) -> int:
+    # characters are counted in utf-16 code units
+    if position["line"] >= len(lines):
+        return sum(len(i) for i in lines)
+
+    offset = sum(len(i) for i in lines[: position["line"]])
+    units = 0
+    for index, char in enumerate(lines[position["line"]]):
+        if units >= position["character"]:
+            return offset + index
+
+        units += 2 if ord(char) > 0xFFFF else 1
+
+    return offset + len(lines[position["line"]])
+
+
+def _apply(text: str, change: _JSONObject) -> str:
+    # a change without a range replaces the entire document
+    if "range" not in change:
+        return change["text"]
+
+    # only ``\n``, ``\r\n`` and ``\r`` end lines
+    lines = _io.StringIO(text, newline="").readlines()
+    start = _offset(lines, change["range"]["start"])
+    end = _offset(lines, change["range"]["end"])
+    return text[:start] + change["text"] + text[end:]
+
+
+def _diagnostics(failure: _Failure) -> list[_JSONObject]:
+    # each error is a diagnostic, with any hint that follows it
+    return [
+        {
+            "range": {
+                "start": {"line": failure.lineno - 1, "character": 0},
+                "end": {"line": failure.lineno, "character": 0},
+            },
+            "severity": _SEVERITY_ERROR,
+            "code": code,
+            "source": __package__,
+            "message": text,
+        }
+        for code, text in _Result.from_failure("", failure).errors
+    ]
+
+
+class _Document:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        # results of the functions in the document when it was last
+        # checked, so only those which have changed are checked again
+        self.results: dict[str, _t.Any] = {}
+        # when the document is due to be checked, if it has changed
+        self.deadline: float | None = None
+
+
+class Server:  # pylint: disable=too-many-instance-attributes
+    """Language server, over a pair of streams.
+
+    Only the open documents are checked, as they are edited, and the
+    files they belong to are not read.
+
+    Each document is checked once it has not changed for a short time,
+    and only the functions within it that have changed since it was
+    last checked are checked again.
+
+    :param fin: Stream to read messages from.
+    :param fout: Stream to write messages to.
+    :param disable: List of errors to disable.
+    :param ignore_args: Ignore args prefixed with an asterisk.
+    :param ignore_kwargs: Ignore kwargs prefixed with two asterisks.
+    :param docstring_style: Style of docstrings to check, detected for
+        each docstring if None.
+    :param kwargs: Options to check functions with.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        fin: _t.BinaryIO,
+        fout: _t.BinaryIO,
+        disable: list[str],
+        ignore_args: bool,
+        ignore_kwargs: bool,
+        docstring_style: str | None,
+        **kwargs: _t.Any,
+    ) -> None:
+        self._fin = fin
+        self._fout = fout
+        self._disable = disable
+        self._ignore_args = ignore_args
+        self._ignore_kwargs = ignore_kwargs
+        self._docstring_style = docstring_style
+        self._kwargs = kwargs
+        self._documents: dict[str, _Document] = {}
+        self._messages: _queue.Queue[_JSONObject | None] = _queue.Queue()
+        self._shutdown = False
+        self._methods: dict[str, _t.Callable[[_JSONObject], _t.Any]] = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown_request,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didSave": self._did_save,
+            "textDocument/didClose": self._did_close,
+        }
+
+    def _listen(self) -> None:
+        # messages are read in the background, so that documents can be
+        # checked while waiting for them
+        while True:
+            message = _read(self._fin)
+            self._messages.put(message)
+            if message is None:
+                break
+
+    def _send(self, message: _JSONObject) -> None:
+        body = _json.dumps({"jsonrpc": "2.0", **message}).encode()
+        self._fout.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        self._fout.flush()
+
+    def _check(self, uri: str) -> None:
+        document = self._documents[uri]
+        document.deadline = None
+        fingerprints = _Fingerprints(document.results)
+        diagnostics = []
+        try:
+            for module in _Modules(
+                disable=self._disable,
+                string=document.text,
+                ignore_args=self._ignore_args,
+                ignore_kwargs=self._ignore_kwargs,
+                check_overridden=self._kwargs["check_overridden"],
+                docstring_style=self._docstring_style,
+            ):
+                for _, failures in _check_module(
+                    module, fingerprints=fingerprints, **self._kwargs
+                ):
+                    for failure in failures:
+                        diagnostics.extend(_diagnostics(failure))
+        except Exception:  # pylint: disable=broad-exception-caught
+            # documents are often invalid while they are being edited,
+            # so the last diagnostics are kept until they are valid
+            return
+
+        document.results = dict(fingerprints)
+        self._send(
+            {
+                "method": "textDocument/publishDiagnostics",
+                "params": {"uri": uri, "diagnostics": diagnostics},
+            }
+        )
+
+    def _check_due(self) -> float | None:
+        # check documents which are due, and return how long until the
+        # next is due, if any
+        now = _time.monotonic()
+        timeout = None
+        for uri, document in self._documents.items():
+            if document.deadline is not None:
+                if document.deadline <= now:
+                    self._check(uri)
+                else:
+                    remaining = document.deadline - now
+                    timeout = (
+                        remaining
+                        if timeout is None
+                        else min(timeout, remaining)
+                    )
+
+        return timeout
+
+    def _initialize(self, _: _JSONObject) -> _JSONObject:
+        return {
+            "capabilities": {
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": _SYNC_INCREMENTAL,
+                    "save": True,
+                }
+            },
+            "serverInfo": {"name": __package__, "version": __version__},
+        }
+
+    def _shutdown_request(self, _: _JSONObject) -> None:
+        self._shutdown = True
+
+    def _did_open(self, params: _JSONObject) -> None:
+        uri = params["textDocument"]["uri"]
+        self._documents[uri] = _Document(params["textDocument"]["text"])
+        self._check(uri)
+
+    def _did_change(self, params: _JSONObject) -> None:
+        document = self._documents[params["textDocument"]["uri"]]
+        for change in params["contentChanges"]:
+            document.text = _apply(document.text, change)
+
+        document.deadline = _time.monotonic() + DEBOUNCE
+
+    def _did_save(self, params: _JSONObject) -> None:
+        uri = params["textDocument"]["uri"]
+        if self._documents[uri].deadline is not None:
+            self._check(uri)
+
+    def _did_close(self, params: _JSONObject) -> None:
+        uri = params["textDocument"]["uri"]
+        del self._documents[uri]
+        self._send(
+            {
+                "method": "textDocument/publishDiagnostics",
+                "params": {"uri": uri, "diagnostics": []},
+            }
+        )
+
+    def _handle(self, message: _JSONObject) -> None:
+        # responses to requests from the server are not expected
+        if "method" not in message:
+            return
+
+        method = self._methods.get(message["method"])
+        params = message.get("params", {})
+        if "id" not in message:
+            # notifications which are not handled are ignored
+            if method is not None:
+                method(params)
+        elif method is None:
+            self._send(
+                {
+                    "id": message["id"],
+                    "error": {
+                        "code": _METHOD_NOT_FOUND,
+                        "message": f"method not found: {message['method']}",
+                    },
+                }
+            )
+        else:
+            self._send({"id": message["id"], "result": method(params)})
+
+    def serve(self) -> int:
+        """Handle messages until told to exit.
+
+        :return: Exit status, which is 0 if shut down first.
+        """
+        _threading.Thread(target=self._listen, daemon=True).start()
+        timeout = None
+        while True:
+            try:
+                message = self._messages.get(timeout=timeout)
+            except _queue.Empty:
+                timeout = self._check_due()
+                continue
+
+            if message is None or message.get("method") == "exit":
+                return int(not self._shutdown)
+
+            self._handle(message)
+            timeout = self._check_due()
@@ -4,9 +4,9 @@ docsig._main
 
 Contains package entry point.
 """
+import sys as _sys
+
 from ._config import Parser as _Parser
-from ._core import docsig as _docsig
-from ._core import pretty_print_error as _pretty_print_error
 
 
 def main() -> int:
@@ -14,23 +14,84 @@ def main() -> int:
 
     Collect config and arguments for the commandline.
 
+    Checks are only imported once arguments have been parsed, so that
+    options such as ``--help`` and ``--version`` return without paying
+    for them.
+
+    If running as a client of a daemon, the checks are run, and so
+    imported, by the daemon instead.
+
     :return: Exit status for whether test failed or not.
     """
     parser = _Parser()
-    _pretty_print_error()
-    return _docsig(
-        *parser.args.path,
-        string=parser.args.string,
-        check_class=parser.args.check_class,
-        check_dunders=parser.args.check_dunders,
-        check_overridden=parser.args.check_overridden,
-        check_protected=parser.args.check_protected,
-        check_property_returns=parser.args.check_property_returns,
-        ignore_no_params=parser.args.ignore_no_params,
-        ignore_args=parser.args.ignore_args,
-        ignore_kwargs=parser.args.ignore_kwargs,
-        no_ansi=parser.args.no_ansi,
-        summary=parser.args.summary,
-        targets=parser.args.target,
-        disable=parser.args.disable
-    )
+    kwargs = {
+        "string": parser.args.string,
+        "check_class": parser.args.check_class,
+        "check_dunders": parser.args.check_dunders,
+        "check_overridden": parser.args.check_overridden,
+        "check_protected": parser.args.check_protected,
+        "check_property_returns": parser.args.check_property_returns,
+        "ignore_no_params": parser.args.ignore_no_params,
+        "ignore_args": parser.args.ignore_args,
+        "ignore_kwargs": parser.args.ignore_kwargs,
+        "no_ansi": parser.args.no_ansi,
+        "summary": parser.args.summary,
+        "targets": parser.args.target,
+        "disable": parser.args.disable,
+        "jobs": parser.args.jobs,
+        "no_cache": parser.args.no_cache,
+        "docstring_style": parser.args.docstring_style,
+        "diff": parser.args.diff,
+        "output_format": parser.args.format,
+        "exclude": parser.args.exclude,
+        "include": parser.args.include,
+        "gitignore": parser.args.gitignore,
+    }
+    if parser.args.lsp:
+        # pylint: disable-next=import-outside-toplevel
+        from ._lsp import Server
+
+        return Server(
+            _sys.stdin.buffer,
+            _sys.stdout.buffer,
+            disable=parser.args.disable,
+            ignore_args=parser.args.ignore_args,
+            ignore_kwargs=parser.args.ignore_kwargs,
+            docstring_style=parser.args.docstring_style,
+            check_class=parser.args.check_class,
+            check_dunders=parser.args.check_dunders,
+            check_overridden=parser.args.check_overridden,
+            check_protected=parser.args.check_protected,
+            check_property_returns=parser.args.check_property_returns,
+            ignore_no_params=parser.args.ignore_no_params,
+            no_ansi=True,
+            targets=parser.args.target,
+        ).serve()
+
+    if parser.args.daemon:
+        # pylint: disable-next=import-outside-toplevel
+        from ._core import pretty_print_error
+        from ._server import serve, socket_path
+
+        pretty_print_error()
+        return serve(socket_path())
+
+    if parser.args.client:
+        # pylint: disable-next=import-outside-toplevel
+        from ._server import request, socket_path
+
+        try:
+            return request(socket_path(), *parser.args.path, **kwargs)
+        except Exception:
+            # checks are only imported to display an error
+            # pylint: disable-next=import-outside-toplevel
+            from ._core import pretty_print_error
+
+            pretty_print_error()
+            raise
+
+    # pylint: disable-next=import-outside-toplevel
+    from ._core import docsig, pretty_print_error
+
+    pretty_print_error()
+    return docsig(*parser.args.path, watch=parser.args.watch, **kwargs)
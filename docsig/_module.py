@@ -7,9 +7,11 @@ from __future__ import annotations as _
 import typing as _t
 from pathlib import Path as _Path
 
-import astroid as _ast
-
+from . import _node
 from ._directives import Directives as _Directives
+from ._files import Files as _Files
+from ._files import decode as _decode
+from ._files import read as _read
 from ._function import Function as _Function
 from ._utils import isprotected as _isprotected
 
@@ -23,15 +25,17 @@ class Parent(_t.List[_Function]):
     :param path: Path to base path representation on.
     :param ignore_args: Ignore args prefixed with an asterisk.
     :param ignore_kwargs: Ignore kwargs prefixed with two asterisks.
+    :param docstring_style: Style of docstrings, detected if None.
     """
 
     def __init__(  # pylint: disable=too-many-arguments
         self,
-        node: _ast.Module | _ast.ClassDef,
+        node: _node.Module | _node.ClassDef,
         directives: _Directives,
         path: _Path | None = None,
         ignore_args: bool = False,
         ignore_kwargs: bool = False,
+        docstring_style: str | None = None,
     ) -> None:
         super().__init__()
         self._name = node.name
@@ -39,27 +43,23 @@ class Parent(_t.List[_Function]):
         overloads = []
         returns = None
         for subnode in node.body:
-            comments, disabled = directives.get(subnode.lineno, ([], []))
-            if isinstance(subnode, _ast.FunctionDef):
+            comments, disabled = directives.get(subnode.lineno)
+            if isinstance(subnode, _node.FunctionDef):
                 func = _Function(
-                    subnode, comments, disabled, ignore_args, ignore_kwargs
+                    subnode,
+                    comments,
+                    disabled,
+                    ignore_args,
+                    ignore_kwargs,
+                    docstring_style,
                 )
                 if func.isoverloaded:
                     overloads.append(func.name)
-                    returns = func.signature.rettype
+                    returns = subnode.returns
                 else:
                     if func.name in overloads:
-                        subnode.returns = returns
-                        # noinspection PyProtectedMember
-                        func._signature._rettype = (
-                            returns
-                            if isinstance(returns, str)
-                            else func._signature._get_rettype(returns)
-                        )
                         # noinspection PyProtectedMember
-                        func._signature._returns = (
-                            str(func._signature._rettype) != "None"
-                        )
+                        func._rettype = returns
 
                     self.append(func)
 
@@ -82,26 +82,45 @@ class _Module(_t.List[Parent]):
         path: _Path | None = None,
         ignore_args: bool = False,
         ignore_kwargs: bool = False,
+        check_overridden: bool = False,
+        docstring_style: str | None = None,
     ) -> None:
         super().__init__()
-        ast = _ast.parse(string)
+        ast = _node.parse(string, check_overridden)
         directives = _Directives(string, disable)
-        self.append(Parent(ast, directives, path, ignore_args, ignore_kwargs))
+        self.append(
+            Parent(
+                ast,
+                directives,
+                path,
+                ignore_args,
+                ignore_kwargs,
+                docstring_style,
+            )
+        )
         for subnode in ast.body:
-            if isinstance(subnode, _ast.ClassDef):
+            if isinstance(subnode, _node.ClassDef):
                 self.append(
                     Parent(
-                        subnode, directives, path, ignore_args, ignore_kwargs
+                        subnode,
+                        directives,
+                        path,
+                        ignore_args,
+                        ignore_kwargs,
+                        docstring_style,
                     )
                 )
 
 
-class Modules(_t.List[_Module]):
-    """Sequence of ``Module`` objects parsed from Python modules or str.
+class Modules(_t.Iterable[_Module]):
+    """Iterable of ``Module`` objects parsed from Python modules or str.
 
     Recursively collect Python files from within all dirs that exist
     under paths provided.
 
+    Each ``Module`` is only parsed once it is reached, so only one
+    needs to be held in memory at a time.
+
     If string is provided, ignore paths.
 
     :param paths: Path(s) to parse ``Module``(s) from.
@@ -109,48 +128,46 @@ class Modules(_t.List[_Module]):
     :param string: String to parse if provided.
     :param ignore_args: Ignore args prefixed with an asterisk.
     :param ignore_kwargs: Ignore kwargs prefixed with two asterisks.
+    :param check_overridden: Overridden methods will be checked.
+    :param docstring_style: Style of docstrings, detected if None.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         *paths: _Path,
         disable: list[str],
         string: str | None = None,
         ignore_args: bool = False,
         ignore_kwargs: bool = False,
+        check_overridden: bool = False,
+        docstring_style: str | None = None,
     ) -> None:
-        super().__init__()
+        self._paths = paths
         self._disable = disable
+        self._string = string
         self._ignore_args = ignore_args
         self._ignore_kwargs = ignore_kwargs
-        if string is not None:
-            self.append(
-                _Module(
-                    string,
-                    disable,
-                    ignore_args=ignore_args,
-                    ignore_kwargs=ignore_kwargs,
-                )
+        self._check_overridden = check_overridden
+        self._docstring_style = docstring_style
+
+    def __iter__(self) -> _t.Iterator[_Module]:
+        if self._string is not None:
+            yield _Module(
+                self._string,
+                self._disable,
+                ignore_args=self._ignore_args,
+                ignore_kwargs=self._ignore_kwargs,
+                check_overridden=self._check_overridden,
+                docstring_style=self._docstring_style,
             )
         else:
-            for path in paths:
-                self._populate(path)
-
-    def _populate(self, root: _Path) -> None:
-        if not root.exists():
-            raise FileNotFoundError(root)
-
-        if root.is_file() and root.name.endswith(".py"):
-            self.append(
-                _Module(
-                    root.read_text(),
+            for path in _Files().find(*self._paths):
+                yield _Module(
+                    _decode(_read(path)),
                     self._disable,
-                    root,
+                    path,
                     self._ignore_args,
                     self._ignore_kwargs,
+                    self._check_overridden,
+                    self._docstring_style,
                 )
-            )
-
-        if root.is_dir():
-            for path in root.iterdir():
-                self._populate(path)
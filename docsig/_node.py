@@ -0,0 +1,425 @@
+"""
+docsig._node
+============
+
+Parsed nodes holding only what is needed to check a module.
+
+Modules are parsed with the stdlib ``ast`` module, which is much faster
+than ``astroid``, and ``astroid`` is only used when inference is needed
+to tell whether a method is overridden.
+"""
+from __future__ import annotations as _
+
+import ast as _ast
+import inspect as _inspect
+import sys as _sys
+import textwrap as _textwrap
+import typing as _t
+from collections import Counter as _Counter
+
+
+def _function_names(cls: type) -> frozenset[str]:
+    # names ``astroid`` represents as functions when it builds a class
+    # from a living object
+    names = set()
+    for name in dir(cls):
+        member = getattr(cls, name)
+        if (
+            _inspect.isfunction(member)
+            or _inspect.ismethoddescriptor(member)
+            or (
+                _inspect.isbuiltin(member)
+                and (
+                    getattr(member, "__module__", None) is not None
+                    or name in ("__new__", "__subclasshook__")
+                )
+            )
+        ):
+            names.add(name)
+
+    return frozenset(names)
+
+
+# every class is a subclass of object
+_OBJECT_METHODS = _function_names(object)
+
+
+class Arguments(_t.NamedTuple):
+    """Names of a function's arguments."""
+
+    posonlyargs: list[str]
+    args: list[str]
+    vararg: str | None
+    kwonlyargs: list[str]
+    kwarg: str | None
+
+
+class FunctionDef(_t.NamedTuple):
+    """Represents a function definition."""
+
+    name: str
+    lineno: int
+    end_lineno: int
+    args: Arguments
+    returns: str | None
+    decorator: str | None
+    doc: str | None
+    parent: Module | ClassDef
+
+
+class Module:
+    """Represents a module.
+
+    :param doc: The module's docstring, if it has one.
+    """
+
+    def __init__(self, doc: str | None = None) -> None:
+        self.name = ""
+        self.doc = doc
+        self.body: list[FunctionDef | ClassDef] = []
+
+
+class ClassDef(Module):
+    """Represents a class definition.
+
+    :param name: Name of the class.
+    :param lineno: Line number of the class declaration.
+    :param doc: The class's docstring, if it has one.
+    :param overridden: Callable for whether a name is defined by any of
+        the class's ancestors as a function.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        lineno: int,
+        doc: str | None,
+        overridden: _t.Callable[[str], bool],
+    ) -> None:
+        super().__init__(doc)
+        self.name = name
+        self.lineno = lineno
+        self._overridden = overridden
+
+    def isoverridden(self, name: str) -> bool:
+        """Whether a method of this class overrides that of an ancestor.
+
+        :param name: Name of the method.
+        :return: Boolean value for whether the method is overridden.
+        """
+        return self._overridden(name)
+
+
+def _get_rettype(returns: _ast.expr | None) -> str | None:
+    if isinstance(returns, _ast.Name):
+        return returns.id
+
+    if isinstance(returns, _ast.Attribute):
+        return returns.attr
+
+    if isinstance(returns, _ast.Constant):
+        return str(returns.value)
+
+    if isinstance(returns, _ast.Subscript):
+        slc = returns.slice
+        # subscripts are wrapped in an index before python 3.9
+        slc = slc.value if _sys.version_info < (3, 9) else slc  # type: ignore
+
+        return f"{_get_rettype(returns.value)}[{_get_rettype(slc)}]"
+
+    if isinstance(returns, _ast.BinOp):
+        return "{} | {}".format(
+            _get_rettype(returns.left), _get_rettype(returns.right)
+        )
+
+    return None
+
+
+def _get_doc(
+    node: _ast.Module | _ast.ClassDef | _ast.FunctionDef,
+) -> str | None:
+    if (
+        node.body
+        and isinstance(node.body[0], _ast.Expr)
+        and isinstance(node.body[0].value, _ast.Constant)
+        and isinstance(node.body[0].value.value, str)
+    ):
+        return node.body[0].value.value
+
+    return None
+
+
+def _get_function(
+    node: _ast.FunctionDef | _ast.AsyncFunctionDef, parent: Module
+) -> FunctionDef:
+    dec = node.decorator_list[0] if node.decorator_list else None
+    return FunctionDef(
+        node.name,
+        # consistent with ``astroid``, which declares decorated
+        # functions from their first decorator
+        dec.lineno if dec is not None else node.lineno,
+        node.end_lineno or node.lineno,
+        Arguments(
+            [i.arg for i in node.args.posonlyargs],
+            [i.arg for i in node.args.args],
+            node.args.vararg.arg if node.args.vararg else None,
+            [i.arg for i in node.args.kwonlyargs],
+            node.args.kwarg.arg if node.args.kwarg else None,
+        ),
+        _get_rettype(node.returns),
+        dec.id if isinstance(dec, _ast.Name) else None,
+        _get_doc(node),
+        parent,
+    )
+
+
+def _get_locals(node: _ast.ClassDef) -> dict[str, bool] | None:
+    # names bound in the class body, and whether the first binding is a
+    # function, or None if the class body is too dynamic to be sure
+    names: dict[str, bool] = {}
+    for stmt in node.body:
+        if any(isinstance(i, _ast.NamedExpr) for i in _ast.walk(stmt)):
+            return None
+
+        if isinstance(stmt, (_ast.FunctionDef, _ast.AsyncFunctionDef)):
+            names.setdefault(stmt.name, True)
+        elif isinstance(stmt, _ast.ClassDef):
+            names.setdefault(stmt.name, False)
+        elif isinstance(stmt, (_ast.Import, _ast.ImportFrom)):
+            for alias in stmt.names:
+                if alias.name == "*":
+                    return None
+
+                name = alias.asname or alias.name.split(".")[0]
+                names.setdefault(name, False)
+        elif isinstance(stmt, (_ast.Assign, _ast.AnnAssign, _ast.AugAssign)):
+            targets = (
+                stmt.targets
+                if isinstance(stmt, _ast.Assign)
+                else [stmt.target]
+            )
+            for target in targets:
+                for name_node in _ast.walk(target):
+                    if isinstance(name_node, _ast.Name) and isinstance(
+                        name_node.ctx, _ast.Store
+                    ):
+                        names.setdefault(name_node.id, False)
+        elif not isinstance(stmt, (_ast.Expr, _ast.Pass)):
+            return None
+
+    return names
+
+
+class _Resolver:
+    # resolve ancestors of classes declared within the module, without
+    # inference, where it is certain which class a base refers to
+    def __init__(self, tree: _ast.Module) -> None:
+        self._tree = tree
+        self._bindings: _Counter[str] | None = None
+        self._classes = {
+            i.name: i for i in tree.body if isinstance(i, _ast.ClassDef)
+        }
+
+    def _count(self, base: str) -> int:
+        # names are only counted once a class has bases to resolve, as
+        # the entire tree is walked to count them
+        if self._bindings is None:
+            self._bindings = _Counter()
+            for node in _ast.walk(self._tree):
+                if isinstance(node, _ast.Name) and not isinstance(
+                    node.ctx, _ast.Load
+                ):
+                    self._bindings[node.id] += 1
+                elif isinstance(
+                    node,
+                    (_ast.FunctionDef, _ast.AsyncFunctionDef, _ast.ClassDef),
+                ):
+                    self._bindings[node.name] += 1
+                elif isinstance(node, (_ast.Import, _ast.ImportFrom)):
+                    for alias in node.names:
+                        name = alias.asname or alias.name.split(".")[0]
+                        self._bindings[name] += 1
+
+        return self._bindings[base]
+
+    def ancestors(self, node: _ast.ClassDef) -> list[dict[str, bool]] | None:
+        """Get the names bound by each of a class's ancestors.
+
+        :param node: Class to get ancestors for.
+        :return: List of names bound by each ancestor, or None if the
+            ancestors cannot be resolved without inference.
+        """
+        ancestors = []
+        for base in node.bases:
+            if not isinstance(base, _ast.Name):
+                return None
+
+            if base.id == "object" and not self._count(base.id):
+                continue
+
+            cls = self._classes.get(base.id)
+            if (
+                cls is None
+                or self._count(base.id) != 1
+                or cls.lineno >= node.lineno
+            ):
+                return None
+
+            names = _get_locals(cls)
+            parents = self.ancestors(cls)
+            if names is None or parents is None:
+                return None
+
+            ancestors.extend([names, *parents])
+
+        return ancestors
+
+
+def _overridden(ancestors: list[dict[str, bool]] | None, name: str) -> bool:
+    return name in _OBJECT_METHODS or any(
+        i.get(name, False) for i in ancestors or []
+    )
+
+
+def _parse_ast(tree: _ast.Module, check_overridden: bool) -> Module | None:
+    module = Module(_get_doc(tree))
+    resolver = None
+    for subnode in tree.body:
+        if isinstance(subnode, (_ast.FunctionDef, _ast.AsyncFunctionDef)):
+            module.body.append(_get_function(subnode, module))
+        elif isinstance(subnode, _ast.ClassDef):
+            resolver = resolver or _Resolver(tree)
+            ancestors = resolver.ancestors(subnode)
+            methods = [
+                i
+                for i in subnode.body
+                if isinstance(i, (_ast.FunctionDef, _ast.AsyncFunctionDef))
+            ]
+            # overridden methods are skipped, so if they cannot be
+            # identified then inference is needed
+            if ancestors is None and methods and not check_overridden:
+                return None
+
+            cls = ClassDef(
+                subnode.name,
+                subnode.lineno,
+                _get_doc(subnode),
+                lambda x, y=ancestors: _overridden(y, x),
+            )
+            cls.body.extend(_get_function(i, cls) for i in methods)
+            module.body.append(cls)
+
+    return module
+
+
+def _get_astroid_function(node: _t.Any, parent: Module) -> FunctionDef:
+    import astroid  # pylint: disable=import-outside-toplevel
+
+    dec = node.decorators.nodes[0] if node.decorators is not None else None
+    return FunctionDef(
+        node.name,
+        node.lineno or 0,
+        node.end_lineno or 0,
+        Arguments(
+            [i.name for i in node.args.posonlyargs],
+            [i.name for i in node.args.args or []],
+            node.args.vararg,
+            [i.name for i in node.args.kwonlyargs],
+            node.args.kwarg,
+        ),
+        _get_astroid_rettype(node.returns),
+        dec.name if isinstance(dec, astroid.Name) else None,
+        node.doc_node.value if node.doc_node is not None else None,
+        parent,
+    )
+
+
+def _get_astroid_rettype(returns: _t.Any) -> str | None:
+    import astroid  # pylint: disable=import-outside-toplevel
+
+    if isinstance(returns, astroid.Name):
+        return returns.name
+
+    if isinstance(returns, astroid.Attribute):
+        return returns.attrname
+
+    if isinstance(returns, astroid.Const):
+        return str(returns.value)
+
+    if isinstance(returns, astroid.Subscript):
+        return "{}[{}]".format(
+            _get_astroid_rettype(returns.value),
+            _get_astroid_rettype(returns.slice),
+        )
+
+    if isinstance(returns, astroid.BinOp):
+        return "{} | {}".format(
+            _get_astroid_rettype(returns.left),
+            _get_astroid_rettype(returns.right),
+        )
+
+    return None
+
+
+def _astroid_overridden(node: _t.Any, name: str) -> bool:
+    import astroid  # pylint: disable=import-outside-toplevel
+
+    for ancestor in node.ancestors():
+        if name in ancestor and isinstance(
+            ancestor[name], astroid.FunctionDef
+        ):
+            return True
+
+    return False
+
+
+def parse_astroid(string: str) -> Module:
+    """Parse a string of Python code with ``astroid``.
+
+    :param string: Python code.
+    :return: Parsed module.
+    """
+    import astroid  # pylint: disable=import-outside-toplevel
+
+    tree = astroid.parse(string)
+    module = Module(tree.doc_node.value if tree.doc_node else None)
+    for subnode in tree.body:
+        if isinstance(subnode, astroid.FunctionDef):
+            module.body.append(_get_astroid_function(subnode, module))
+        elif isinstance(subnode, astroid.ClassDef):
+            cls = ClassDef(
+                subnode.name,
+                subnode.lineno or 0,
+                subnode.doc_node.value if subnode.doc_node else None,
+                lambda x, y=subnode: _astroid_overridden(y, x),
+            )
+            cls.body.extend(
+                _get_astroid_function(i, cls)
+                for i in subnode.body
+                if isinstance(i, astroid.FunctionDef)
+            )
+            module.body.append(cls)
+
+    return module
+
+
+def parse(string: str, check_overridden: bool = False) -> Module:
+    """Parse a string of Python code.
+
+    The stdlib ``ast`` module is used unless inference is needed to
+    identify overridden methods, which is only needed if they are not
+    to be checked.
+
+    :param string: Python code.
+    :param check_overridden: Overridden methods will be checked.
+    :return: Parsed module.
+    """
+    try:
+        # consistent with ``astroid``
+        tree = _ast.parse(_textwrap.dedent(string) + "\n")
+    except SyntaxError:
+        # let ``astroid`` raise its own error, so errors are the same
+        # whichever parser is used
+        return parse_astroid(string)
+
+    return _parse_ast(tree, check_overridden) or parse_astroid(string)
@@ -4,10 +4,12 @@ docsig._report
 """
 from __future__ import annotations as _
 
+import functools as _functools
 import typing as _t
 
 from . import messages as _messages
 from ._directives import ERRORS as _ERRORS
+from ._directives import RuleSet as _RuleSet
 from ._function import RETURN as _RETURN
 from ._function import Function as _Function
 from ._function import Param as _Param
@@ -16,24 +18,65 @@ from ._utils import almost_equal as _almost_equal
 _MIN_MATCH = 0.8
 _MAX_MATCH = 1.0
 
+# errors found by checking each parameter
+_PARAMS = "E101", "E107", "E110", "E112", "E115", "E116"
+
+# errors found by checking the docstring
+_DOCSTRING = (
+    "E102",
+    "E103",
+    "E104",
+    "E105",
+    "E106",
+    "E108",
+    "E109",
+    "E111",
+    *_PARAMS,
+)
+
+# errors which are only reported if no other errors, including disabled
+# errors, have been found
+_CATCH_ALL = "E110", "E112"
+
+
+@_functools.lru_cache(maxsize=None)
+def _untargeted(targets: tuple[str, ...]) -> _RuleSet:
+    # errors disabled by targeting others, which are the same for every
+    # function in a run
+    errors = list(_ERRORS)
+    for target in targets:
+        errors.remove(target)
+
+    return _RuleSet(errors)
+
+
+@_functools.lru_cache(maxsize=None)
+def _disabled(targets: tuple[str, ...], disable: _RuleSet) -> _RuleSet:
+    # most functions are disabled for the same errors, so this is only
+    # computed once for each
+    return disable.disable(_untargeted(targets)) if targets else disable
+
 
 class _MessageSequence(_t.List[str]):
     def __init__(
-        self,
-        targets: list[str] | None = None,
-        disable: list[str] | None = None,
+        self, targets: list[str] | None = None, disable: _RuleSet | None = None
     ) -> None:
         super().__init__()
-        self._disable = disable or []
+        self._disable = _disabled(tuple(targets or ()), disable or _RuleSet())
         self._disabled = False
-        if targets:
-            errors = list(_ERRORS)
-            for target in targets:
-                errors.remove(target)
+        self._errors: list[str] = []
+        self._all = not self._disable.issuperset(_CATCH_ALL)
 
-            self._disable.extend(errors)
+    def enabled(self, *codes: str) -> bool:
+        """Confirm whether checking for errors could affect the report.
 
-        self._errors: list[str] = []
+        Every check could, if any errors are enabled which depend on
+        whether others were found.
+
+        :param codes: Errors to check for.
+        :return: Boolean value for whether to check for the errors.
+        """
+        return self._all or not self._disable.issuperset(codes)
 
     def add(self, value: str, **kwargs) -> None:
         """Add an error to the container.
@@ -65,7 +108,7 @@ class Report(_MessageSequence):
 
     :param func: Function object.
     :param targets: List of errors to target.
-    :param disable: List of errors to disable.
+    :param disable: Set of errors to disable.
     :param check_property_returns: Run return checks on properties.
     """
 
@@ -73,7 +116,7 @@ class Report(_MessageSequence):
         self,
         func: _Function,
         targets: list[str],
-        disable: list[str],
+        disable: _RuleSet,
         check_property_returns: bool,
     ) -> None:
         super().__init__(targets, disable)
@@ -81,6 +124,27 @@ class Report(_MessageSequence):
         self._no_prop_return = func.isproperty and not check_property_returns
         self._no_returns = func.isinit or self._no_prop_return
 
+    @classmethod
+    def from_messages(cls, messages: list[str]) -> Report:
+        """Construct a compiled report from its messages.
+
+        Only what is needed to display the report is kept, such as for
+        a report which was cached.
+
+        :param messages: Messages of the report.
+        :return: Instantiated report object.
+        """
+        report = cls.__new__(cls)
+        report.extend(messages)
+        return report
+
+    def __getstate__(self) -> dict[str, _t.Any]:
+        # the function is only needed to compile the report, and its
+        # syntax tree cannot be pickled
+        state = dict(self.__dict__)
+        state["_func"] = None
+        return state
+
     def order(self, sig: _Param, doc: _Param) -> None:
         """Test for documented parameters and their order.
 
@@ -99,12 +163,12 @@ class Report(_MessageSequence):
 
     def missing_func_docstring(self) -> None:
         """Test that docstring is not missing from func."""
-        if not self._func.isinit and self._func.docstring.string is None:
+        if not self._func.isinit and self._func.doc is None:
             self.add("E113")
 
     def missing_class_docstring(self) -> None:
         """Test that docstring is not missing from class."""
-        if self._func.isinit and self._func.docstring.string is None:
+        if self._func.isinit and self._func.doc is None:
             self.add("E114")
 
     def missing(self) -> None:
@@ -234,44 +298,75 @@ class Report(_MessageSequence):
         return f"\n{prefix}".join(self) + "\n"
 
 
-def generate_report(
+def generate_report(  # pylint: disable=too-many-branches
     func: _Function,
     targets: list[str],
-    disable: list[str],
+    disable: _RuleSet,
     check_property_returns: bool,
 ) -> Report:
     """Generate report if function or method has failed.
 
+    Checks are skipped for errors which cannot be reported, so the
+    docstring is not parsed unless there are errors enabled for it.
+
     :param func: Function object.
     :param targets: List of errors to target.
-    :param disable: List of errors to disable.
+    :param disable: Set of errors to disable.
     :param check_property_returns: Run return checks on properties.
     :return: Compiled report.
     """
     report = Report(func, targets, disable, check_property_returns)
-    report.invalid_directive()
-    report.invalid_directive_options()
-    report.missing_class_docstring()
-    report.missing_func_docstring()
-    if func.docstring.string is not None:
-        report.return_not_typed()
-        report.exists()
-        report.missing()
-        report.duplicates()
-        report.extra_return()
-        report.missing_return()
-        report.property_return()
-        report.class_return()
-        for index in range(len(func)):
-            arg = func.signature.args.get(index)
-            doc = func.docstring.args.get(index)
-            report.description_syntax(doc)
-            report.indent_syntax(doc)
-            if arg != doc:
-                report.order(arg, doc)
-                report.incorrect(arg, doc)
-                report.misspelled(arg, doc)
-                report.not_equal(arg, doc)
+    if report.enabled("E201", "E202"):
+        report.invalid_directive()
+
+    if report.enabled("E203", "E204"):
+        report.invalid_directive_options()
+
+    if report.enabled("E114"):
+        report.missing_class_docstring()
+
+    if report.enabled("E113"):
+        report.missing_func_docstring()
+
+    if func.doc is not None and report.enabled(*_DOCSTRING):
+        if report.enabled("E109"):
+            report.return_not_typed()
+
+        if report.enabled("E102"):
+            report.exists()
+
+        if report.enabled("E103"):
+            report.missing()
+
+        if report.enabled("E106"):
+            report.duplicates()
+
+        if report.enabled("E104"):
+            report.extra_return()
+
+        if report.enabled("E105"):
+            report.missing_return()
+
+        if report.enabled("E108"):
+            report.property_return()
+
+        if report.enabled("E111"):
+            report.class_return()
+
+        if report.enabled(*_PARAMS):
+            for index in range(len(func)):
+                arg = func.signature.args.get(index)
+                doc = func.docstring.args.get(index)
+                report.description_syntax(doc)
+                report.indent_syntax(doc)
+                if arg != doc:
+                    report.order(arg, doc)
+                    report.incorrect(arg, doc)
+                    # the only check of each parameter which is slow
+                    if report.enabled("E112"):
+                        report.misspelled(arg, doc)
+
+                    report.not_equal(arg, doc)
 
     report.sort()
     return report
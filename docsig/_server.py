@@ -0,0 +1,158 @@
+"""
+docsig._server
+==============
+
+Check files for clients from a long-running process, so that each
+check does not pay for starting a new one.
+"""
+from __future__ import annotations as _
+
+import builtins as _builtins
+import contextlib as _contextlib
+import getpass as _getpass
+import io as _io
+import json as _json
+import os as _os
+import socket as _socket
+import socketserver as _socketserver
+import tempfile as _tempfile
+import typing as _t
+from pathlib import Path as _Path
+
+
+def socket_path() -> _Path:
+    """Get path of the socket the daemon listens on.
+
+    This can be set with the ``DOCSIG_SOCKET`` environment variable.
+
+    :return: Path to socket.
+    """
+    path = _os.environ.get("DOCSIG_SOCKET")
+    if path is None:
+        return _Path(_tempfile.gettempdir()) / "{}-{}.sock".format(
+            __package__, _getpass.getuser()
+        )
+
+    return _Path(path)
+
+
+def _respond(request: dict[str, _t.Any]) -> dict[str, _t.Any]:
+    # only the daemon needs to import the checks, not its clients
+    # pylint: disable-next=import-outside-toplevel
+    from ._core import docsig
+
+    # paths, and the cache, are relative to the client's working
+    # directory, and requests are handled one at a time, so the daemon
+    # can change to it while checking
+    cwd = _os.getcwd()
+    stdout = _io.StringIO()
+    try:
+        _os.chdir(request["cwd"])
+        with _contextlib.redirect_stdout(stdout):
+            status = docsig(
+                *[_Path(i) for i in request["path"]], **request["options"]
+            )
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        return {
+            "output": stdout.getvalue(),
+            "error": type(err).__name__,
+            "message": str(err),
+        }
+    finally:
+        _os.chdir(cwd)
+
+    return {"output": stdout.getvalue(), "status": status}
+
+
+class _Handler(_socketserver.StreamRequestHandler):
+    # each line is a request, and each is responded to with a line
+    def handle(self) -> None:
+        for line in self.rfile:
+            response = _respond(_json.loads(line))
+            self.wfile.write(_json.dumps(response).encode() + b"\n")
+
+
+class Server(_socketserver.UnixStreamServer):
+    """Check files for clients connected to a Unix socket.
+
+    Requests are JSON objects, one per line, of the working directory
+    of the client, the paths to check, and the keyword arguments to
+    check them with, which are the same as those of ``docsig``.
+
+    Each is responded to with a JSON object of the output of the check,
+    and its exit status, or the error raised by it.
+
+    Checks are run in this process, one at a time, so caches are kept
+    warm between them.
+
+    :param path: Path of the socket to listen on.
+    """
+
+    def __init__(self, path: _Path) -> None:
+        if path.exists():
+            try:
+                with _socket.socket(_socket.AF_UNIX) as sock:
+                    sock.connect(str(path))
+            except OSError:
+                # left behind by a daemon which did not exit cleanly
+                path.unlink()
+            else:
+                raise FileExistsError(f"daemon already listening on {path}")
+
+        super().__init__(str(path), _Handler)
+        self._path = path
+
+    def server_close(self) -> None:
+        """Stop listening, and remove the socket."""
+        super().server_close()
+        self._path.unlink()
+
+
+def serve(path: _Path) -> int:
+    """Check files for clients until interrupted.
+
+    :param path: Path of the socket to listen on.
+    :return: Exit status.
+    """
+    with Server(path) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+
+def request(path: _Path, *paths: _Path, **kwargs: _t.Any) -> int:
+    """Check files with a running daemon.
+
+    The output of the check is printed as though it were run in this
+    process.
+
+    :param path: Path of the socket the daemon listens on.
+    :param paths: Path(s) to check.
+    :param kwargs: Keyword arguments to check with.
+    :return: Exit status for whether test failed or not.
+    """
+    data = {
+        "cwd": _os.getcwd(),
+        "path": [str(i) for i in paths],
+        "options": kwargs,
+    }
+    with _socket.socket(_socket.AF_UNIX) as sock:
+        sock.connect(str(path))
+        sock.sendall(_json.dumps(data).encode() + b"\n")
+        with sock.makefile("rb") as fin:
+            response = _json.loads(fin.readline())
+
+    print(response["output"], end="")
+    if "error" in response:
+        # raise the same error as would have been raised in this process
+        # if it is a builtin one
+        error = getattr(_builtins, response["error"], None)
+        if not isinstance(error, type) or not issubclass(error, Exception):
+            error = RuntimeError
+
+        raise error(response["message"])
+
+    return response["status"]
@@ -4,8 +4,24 @@ docsig._utils
 """
 from __future__ import annotations as _
 
+import functools as _functools
+from collections import Counter as _Counter
 from difflib import SequenceMatcher as _SequenceMatcher
 
+SPHINX = "sphinx"
+GOOGLE = "google"
+NUMPY = "numpy"
+
+#: Docstring styles which can be checked.
+STYLES = SPHINX, GOOGLE, NUMPY
+
+JSONL = "jsonl"
+JSON = "json"
+SARIF = "sarif"
+
+#: Formats which can be output instead of the report.
+FORMATS = JSONL, JSON, SARIF
+
 
 def isprotected(name: str | None) -> bool:
     """Confirm whether attribute is protected or not.
@@ -16,9 +32,20 @@ def isprotected(name: str | None) -> bool:
     return str(name).startswith("_")
 
 
+@_functools.lru_cache(maxsize=4096)
+def _counts(string: str) -> _Counter[str]:
+    # names are compared with many others, so their characters are only
+    # counted once
+    return _Counter(string)
+
+
+@_functools.lru_cache(maxsize=4096)
 def almost_equal(str1: str, str2: str, mini: float, maxi: float) -> bool:
     """Show result for more than the minimum but less than the maximum.
 
+    Strings which cannot be similar enough, by their length or by the
+    characters they share, are ruled out before they are compared.
+
     :param str1: String one to compare with string two.
     :param str2: String two to compare with string one.
     :param mini: Minimum difference allowed between two strings.
@@ -26,4 +53,15 @@ def almost_equal(str1: str, str2: str, mini: float, maxi: float) -> bool:
         equal.
     :return: Boolean result for whether both strings are almost equal.
     """
+    # upper bounds of the ratio, calculated the same way it is, so
+    # strings are only ruled out if their ratio could not be more
+    length = len(str1) + len(str2)
+    if length and 2.0 * min(len(str1), len(str2)) / length <= mini:
+        return False
+
+    counts = _counts(str2)
+    matches = sum(min(v, counts[k]) for k, v in _counts(str1).items())
+    if length and 2.0 * matches / length <= mini:
+        return False
+
     return mini < _SequenceMatcher(a=str1, b=str2).ratio() < maxi
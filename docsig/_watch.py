@@ -0,0 +1,218 @@
+"""
+docsig._watch
+=============
+"""
+from __future__ import annotations as _
+
+import ctypes as _ctypes
+import os as _os
+import select as _select
+import struct as _struct
+import sys as _sys
+import time as _time
+import typing as _t
+from pathlib import Path as _Path
+
+from ._files import Files as _Files
+
+#: Seconds between each snapshot of files when polling for changes.
+POLL_INTERVAL = 0.5
+
+# seconds to wait for any other changes after a change is found, as
+# saving a file can take more than one event
+_SETTLE = 0.05
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_ISDIR = 0x40000000
+_IN_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT = _struct.Struct("iIII")
+
+
+class _Poll:
+    # compare snapshots of the modification time and size of files
+    def __init__(
+        self,
+        *paths: _Path,
+        files: _Files | None = None,
+        interval: float = POLL_INTERVAL,
+    ) -> None:
+        self._paths = paths
+        self._files = files or _Files()
+        self._interval = interval
+        self._snapshot = self._take()
+
+    def _take(self) -> dict[_Path, tuple[int, int]]:
+        snapshot = {}
+        for path in self._files.find(*self._paths):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            snapshot[path] = stat.st_mtime_ns, stat.st_size
+
+        return snapshot
+
+    def wait(self) -> list[_Path]:
+        """Wait for files to change.
+
+        :return: List of changed files.
+        """
+        while True:
+            _time.sleep(self._interval)
+            snapshot = self._take()
+            changed = [
+                k for k, v in snapshot.items() if self._snapshot.get(k) != v
+            ]
+            self._snapshot = snapshot
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        """Stop watching for changes."""
+
+
+class _Inotify:
+    # receive events from the kernel, watching each directory as
+    # inotify is not recursive
+    def __init__(
+        self, libc: _ctypes.CDLL, *paths: _Path, files: _Files | None = None
+    ) -> None:
+        self._libc = libc
+        self._files = files or _Files()
+        self._dirs: dict[int, _Path] = {}
+        self._names: dict[int, set[str] | None] = {}
+        self._fd = libc.inotify_init1(_os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(_ctypes.get_errno(), "inotify_init1")
+
+        try:
+            for path in paths:
+                if path.is_dir():
+                    self._add_tree(path)
+                else:
+                    self._add(path.parent, path.name)
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, path: _Path, name: str | None = None) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, _os.fsencode(path), _IN_MASK
+        )
+        if wd < 0:
+            raise OSError(_ctypes.get_errno(), "inotify_add_watch", str(path))
+
+        self._dirs.setdefault(wd, path)
+        names = self._names.get(wd, set())
+        if names is not None:
+            self._names[wd] = None if name is None else names | {name}
+
+    def _add_tree(self, path: _Path) -> None:
+        self._add(path)
+        for subpath in path.iterdir():
+            if (
+                subpath.is_dir()
+                and not subpath.is_symlink()
+                and self._files.accepts(subpath, isdir=True)
+            ):
+                self._add_tree(subpath)
+
+    def _read(self, changed: dict[_Path, None]) -> None:
+        data = _os.read(self._fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, size = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = _os.fsdecode(data[offset : offset + size].rstrip(b"\0"))
+            offset += size
+            parent = self._dirs.get(wd)
+            if parent is None:
+                continue
+
+            path = parent / name
+            names = self._names[wd]
+            if mask & _IN_ISDIR:
+                if names is None and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._add_tree(path)
+                    changed.update(dict.fromkeys(self._files.find(path)))
+            elif (
+                mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO)
+                and self._files.accepts(path)
+                and (names is None or name in names)
+            ):
+                changed[path] = None
+
+    def close(self) -> None:
+        """Stop watching for changes."""
+        _os.close(self._fd)
+
+    def wait(self) -> list[_Path]:
+        """Wait for files to change.
+
+        :return: List of changed files.
+        """
+        changed: dict[_Path, None] = {}
+        timeout = None
+        while True:
+            ready, _, _ = _select.select([self._fd], [], [], timeout)
+            if not ready:
+                return [i for i in changed if i.is_file()]
+
+            self._read(changed)
+            if changed:
+                timeout = _SETTLE
+
+
+def _libc() -> _ctypes.CDLL | None:
+    # inotify is only available on linux
+    if not _sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = _ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1  # pylint: disable=pointless-statement
+        libc.inotify_add_watch  # pylint: disable=pointless-statement
+    except (OSError, AttributeError):
+        return None
+
+    return libc
+
+
+def watch(
+    *paths: _Path, files: _Files | None = None
+) -> _t.Iterator[list[_Path]]:
+    """Wait for files to check within all paths provided to change.
+
+    Changes are received from inotify where it is available, otherwise
+    files are polled for changes to their modification time or size.
+
+    Directories which are excluded are not watched.
+
+    :param paths: Path(s) to watch.
+    :param files: Files to check, Python files if None.
+    :return: Iterator of changed files, each time they change.
+    """
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(path)
+
+    watcher: _Poll | _Inotify | None = None
+    libc = _libc()
+    if libc is not None:
+        try:
+            watcher = _Inotify(libc, *paths, files=files)
+        except OSError:
+            # such as when the limit of watches is reached
+            watcher = None
+
+    if watcher is None:
+        watcher = _Poll(*paths, files=files)
+
+    try:
+        while True:
+            yield watcher.wait()
+    finally:
+        watcher.close()
@@ -0,0 +1,403 @@
+"""
+tests.benchmark_test
+====================
+"""
+# pylint: disable=protected-access
+import difflib
+import os
+import subprocess
+import sys
+import time
+import timeit
+import typing as t
+from pathlib import Path
+
+import pytest
+from pygments.formatters.terminal256 import Terminal256Formatter
+from pygments.lexers.python import PythonLexer
+
+import docsig._directives
+import docsig._display
+import docsig._files
+import docsig._module
+import docsig._node
+import docsig._report
+import docsig._utils
+
+#: Number of times to repeat each benchmark, the fastest of which is
+#: compared.
+REPEAT = 3
+
+#: Maximum time, in microseconds, to import what the commandline needs
+#: to parse its arguments.
+IMPORT_BUDGET = 50000
+
+#: Modules which are slow to import, and only needed for some checks.
+HEAVY_MODULES = "astroid", "sphinx", "pygments", "concurrent.futures.process"
+
+MODULE = """
+class Klass{index}:
+    \"\"\"Class docstring.
+
+    :param param1: About param1.
+    \"\"\"
+
+    def __init__(self, param1) -> None:
+        self.param1 = param1
+
+    @property
+    def prop(self) -> int:
+        \"\"\"Property docstring.\"\"\"
+        return self.param1
+
+    def method(self, param1, *args, param2: int = 0, **kwargs) -> str:
+        \"\"\"Method docstring.
+
+        :param param1: About param1.
+        :param args: About args.
+        :param param2: About param2.
+        :param kwargs: About kwargs.
+        :return: About return.
+        \"\"\"
+        return str(param1)
+
+
+def function_{index}(param1: int, param2: str) -> dict[str, int] | None:
+    \"\"\"Function docstring.
+
+    :param param1: About param1.
+    :param param2: About param2.
+    :return: About return.
+    \"\"\"
+    return {{param2: param1}}
+"""
+
+
+def test_parse_equal() -> None:
+    """Test both parsers produce the same nodes for a large module."""
+    string = "".join(MODULE.format(index=i) for i in range(200))
+    fast = docsig._node.parse(string)
+    slow = docsig._node.parse_astroid(string)
+    assert [(i.name, getattr(i, "lineno", 0)) for i in fast.body] == [
+        (i.name, getattr(i, "lineno", 0)) for i in slow.body
+    ]
+
+
+@pytest.mark.benchmark
+def test_parse_benchmark() -> None:
+    """Test the ``ast`` parser is faster than the ``astroid`` parser."""
+    string = "".join(MODULE.format(index=i) for i in range(200))
+    fast_time = min(
+        timeit.repeat(
+            lambda: docsig._node.parse(string), number=1, repeat=REPEAT
+        )
+    )
+    slow_time = min(
+        timeit.repeat(
+            lambda: docsig._node.parse_astroid(string), number=1, repeat=REPEAT
+        )
+    )
+    assert fast_time * 2 < slow_time
+
+
+FAILURE = """
+def function_{index}(param1, param2, *args, **kwargs) -> int:
+    \"\"\"Function docstring.
+
+    :param param1: About param1.
+    :param param3: About param3.
+    \"\"\"
+"""
+
+
+def _render(count: int) -> t.Tuple[float, t.List[str]]:
+    # time to render the functions of a report
+    module = docsig._module._Module(
+        "".join(FAILURE.format(index=i) for i in range(count)), []
+    )
+    functions = [i for p in module for i in p]
+    start = timeit.default_timer()
+    rendered = [str(docsig._display.FuncStr(i)) for i in functions]
+    return timeit.default_timer() - start, rendered
+
+
+def _highlight_separately(monkeypatch: pytest.MonkeyPatch) -> None:
+    # highlight each fragment of code separately, as it was before
+    highlight, _, _ = docsig._display._pygments()
+    monkeypatch.setattr(
+        docsig._display,
+        "_highlight",
+        lambda x: highlight(
+            x,
+            PythonLexer(),  # type: ignore
+            Terminal256Formatter(style="monokai"),  # type: ignore
+        ).strip(),
+    )
+    monkeypatch.setattr(docsig._display, "_color", lambda x, y: y.get(x))
+    monkeypatch.setattr(
+        docsig._display._ANSI,
+        "declaration",
+        lambda x, y, z, e: x.syntax(f"{y} {z}{e}"),
+    )
+
+
+def test_render_equal(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test functions are rendered the same as when highlighted apart.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+    _, fast = _render(300)
+    _highlight_separately(monkeypatch)
+    _, slow = _render(300)
+    assert fast == slow
+
+
+@pytest.mark.benchmark
+def test_render_benchmark(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test functions are rendered quickly with syntax highlighting.
+
+    Rendering a report of 10,000 failures needs to be faster than it
+    was to render only 300 of them, when each fragment of code was
+    highlighted separately.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+    fast_time, _ = _render(10000)
+    _highlight_separately(monkeypatch)
+    slow_time, _ = _render(300)
+    assert fast_time < slow_time
+
+
+def _run(*args: str, cwd: t.Optional[Path] = None) -> t.Set[str]:
+    # run in a fresh interpreter, as this one has already imported
+    # everything, and return what was imported, and how long it took
+    stderr = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys; from docsig import main; sys.exit(main())",
+            *args,
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=cwd,
+        # the package may not be installed
+        env={
+            **os.environ,
+            "PYTHONPATH": str(Path(docsig.__file__).parents[1]),
+        },
+    ).stderr
+    return {i for i in stderr.splitlines() if i.startswith("import time:")}
+
+
+def _import_time(lines: t.Set[str], module: str) -> int:
+    for line in lines:
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+
+    raise ValueError(module)
+
+
+@pytest.mark.benchmark
+def test_import_benchmark() -> None:
+    """Test importing what is needed to parse arguments is within budget.
+
+    Checks are imported afterwards, so ``--version`` and ``--help`` are
+    not slowed down by them.
+    """
+    import_time = min(
+        _import_time(_run("--version"), "docsig._main") for _ in range(REPEAT)
+    )
+    assert import_time < IMPORT_BUDGET
+
+
+@pytest.mark.parametrize(
+    "args,expected",
+    [
+        (["--version"], []),
+        (["--no-ansi", "--no-cache", "file.py"], []),
+        (["--no-cache", "file.py"], ["pygments"]),
+        (["--format", "jsonl", "--no-cache", "file.py"], []),
+    ],
+    ids=["version", "no-ansi", "ansi", "format"],
+)
+def test_heavy_imports(
+    tmp_path: Path, args: t.List[str], expected: t.List[str]
+) -> None:
+    """Test modules which are slow to import are only imported if needed.
+
+    :param tmp_path: Create and return temporary directory.
+    :param args: Commandline arguments.
+    :param expected: Heavy modules expected to be imported.
+    """
+    (tmp_path / "file.py").write_text(
+        "def function(param1, param2) -> None:\n"
+        '    """Docstring.\n\n'
+        "    :param param1: About param1.\n"
+        '    """\n'
+    )
+    imported = {i.split("|")[2].strip() for i in _run(*args, cwd=tmp_path)}
+    assert [i for i in HEAVY_MODULES if i in imported] == expected
+
+
+GOOGLE = """
+def function_{index}(param1: int, param2: str) -> int:
+    \"\"\"Function docstring.
+
+    Args:
+        param1: About param1.
+        param2: About param2.
+
+    Returns:
+        About return.
+    \"\"\"
+"""
+
+
+def _report(targets: t.List[str]) -> float:
+    # time to generate reports, without parsing the module
+    module = docsig._module._Module(
+        "".join(GOOGLE.format(index=i) for i in range(500)), []
+    )
+    functions = [i for p in module for i in p]
+    start = timeit.default_timer()
+    for func in functions:
+        docsig._report.generate_report(func, targets, func.disabled, False)
+
+    return timeit.default_timer() - start
+
+
+@pytest.mark.benchmark
+def test_report_benchmark() -> None:
+    """Test reports are generated quickly when targeting fewer errors.
+
+    Targeting only missing docstrings needs to be faster than checking
+    for all errors, as the docstrings are not parsed.
+    """
+    fast_time = min(_report(["E113"]) for _ in range(REPEAT))
+    slow_time = min(_report([]) for _ in range(REPEAT))
+    assert fast_time * 2 < slow_time
+
+
+def _names() -> t.List[str]:
+    # names of parameters, some of which are misspelled
+    words = "name value index count path size key data item mode".split()
+    names = [f"{i}_{j}" for i in words for j in words if i != j]
+    return names + [f"{i[:-1]}y" for i in names[::3]]
+
+
+def _pairs() -> t.List[t.Tuple[str, str]]:
+    names = _names()
+    return [(i, j) for i in names[:100] for j in names]
+
+
+def _almost_equal(pairs: t.List[t.Tuple[str, str]]) -> t.List[bool]:
+    almost_equal = docsig._utils.almost_equal.__wrapped__  # type: ignore
+    return [almost_equal(i, j, 0.8, 1.0) for i, j in pairs]
+
+
+def _ratio(pairs: t.List[t.Tuple[str, str]]) -> t.List[bool]:
+    return [
+        0.8 < difflib.SequenceMatcher(a=i, b=j).ratio() < 1.0 for i, j in pairs
+    ]
+
+
+def test_misspelled_equal() -> None:
+    """Test names are found to be misspelled the same as in full."""
+    pairs = _pairs()
+    assert _almost_equal(pairs) == _ratio(pairs)
+    assert any(_almost_equal(pairs))
+
+
+@pytest.mark.benchmark
+def test_misspelled_benchmark() -> None:
+    """Test names are compared quickly for misspellings.
+
+    Comparing each pair of names needs to be faster than comparing all
+    of them in full.
+    """
+    pairs = _pairs()
+    fast_time = min(
+        timeit.repeat(lambda: _almost_equal(pairs), number=1, repeat=REPEAT)
+    )
+    slow_time = min(
+        timeit.repeat(lambda: _ratio(pairs), number=1, repeat=REPEAT)
+    )
+    assert fast_time * 2 < slow_time
+
+
+@pytest.mark.benchmark
+def test_directives_benchmark() -> None:
+    """Test code without directives is not tokenized.
+
+    Finding the directives of a large module without any needs to be
+    much faster than finding them in one with a single directive.
+    """
+    string = "".join(MODULE.format(index=i) for i in range(200))
+    fast_time = min(
+        timeit.repeat(
+            lambda: docsig._directives.Directives(string, []),
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+    slow_time = min(
+        timeit.repeat(
+            lambda: docsig._directives.Directives(
+                f"{string}# docsig: disable\n", []
+            ),
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+    assert fast_time * 10 < slow_time
+
+
+@pytest.mark.benchmark
+def test_prefetch_benchmark(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test files are read while others are checked.
+
+    With the latency of a network filesystem, reading files ahead of
+    when they are checked needs to be much faster than reading each
+    file just before it is checked.
+
+    :param tmp_path: Create and return temporary directory.
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+    paths = [tmp_path / f"file_{i}.py" for i in range(20)]
+    for index, path in enumerate(paths):
+        path.write_text(MODULE.format(index=index))
+
+    read = docsig._files.read
+
+    def _read(path: Path) -> docsig._files.Buffer:
+        time.sleep(0.01)
+        return read(path)
+
+    def _check(sources: t.Iterable[t.Tuple[Path, bytes]]) -> None:
+        for _, source in sources:
+            time.sleep(0.01)
+            docsig._files.decode(source)
+
+    monkeypatch.setattr("docsig._files.read", _read)
+    fast_time = min(
+        timeit.repeat(
+            lambda: _check(docsig._files.prefetch(paths)),
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+    slow_time = min(
+        timeit.repeat(
+            lambda: _check((p, _read(p)) for p in paths),
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+    assert fast_time * 1.5 < slow_time
@@ -2,11 +2,14 @@
 tests.conftest
 ==============
 """
+import threading
+import typing as t
 from pathlib import Path
 
 import pytest
 
 import docsig
+import docsig._server
 
 from . import InitFileFixtureType, MockMainType, long
 
@@ -58,3 +61,22 @@ def fixture_init_file(tmp_path: Path) -> InitFileFixtureType:
         return file
 
     return _init_file
+
+
+@pytest.fixture(name="daemon")
+def fixture_daemon(monkeypatch: pytest.MonkeyPatch) -> t.Iterator[Path]:
+    """Run daemon in the background for clients to connect to.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :return: Path to the socket the daemon listens on.
+    """
+    # relative to the temporary directory, as the length of the path to
+    # a socket is limited
+    path = Path("docsig.sock")
+    monkeypatch.setenv("DOCSIG_SOCKET", str(path))
+    with docsig._server.Server(path) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield path
+        server.shutdown()
+        thread.join()
@@ -3,12 +3,42 @@ tests.misc_test
 ===============
 """
 # pylint: disable=protected-access
+import ast
+import concurrent.futures
+import difflib
+import io
+import json
+import mmap
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import typing as t
+from pathlib import Path
+
+import astroid
 import pytest
 from templatest import templates
 
+import docsig
+import docsig._core
+import docsig._directives
+import docsig._display
+import docsig._files
+import docsig._function
+import docsig._lsp
+import docsig._node
+import docsig._report
+import docsig._server
+import docsig._utils
+import docsig._watch
 import docsig.messages
 
-from . import InitFileFixtureType, MockMainType, long, short
+from . import NAME, TEMPLATE, InitFileFixtureType, MockMainType, long, short
 
 
 @pytest.mark.parametrize("arg", (short.v, long.version))
@@ -106,3 +136,1899 @@ def test_file_not_found_error(main: MockMainType) -> None:
         main("does-not-exist")
 
     assert str(err.value) == "does-not-exist"
+
+
+@pytest.mark.parametrize("jobs", ["0", "2"])
+def test_jobs(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    jobs: str,
+) -> None:
+    """Test that checking in parallel reports the same as serially.
+
+    :param tmp_path: Create and return temporary directory.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param jobs: Number of processes to check files with.
+    """
+    template = templates.registered.getbyname("m-fail-s").template
+    for index in range(5):
+        file = tmp_path / "module" / f"file_{index}.py"
+        file.parent.mkdir(exist_ok=True)
+        file.write_text(template)  # type: ignore
+
+    serial_status = main(".", long.summary)
+    serial_out = capsys.readouterr().out
+    assert main(".", long.summary, long.jobs, jobs) == serial_status
+    assert capsys.readouterr().out == serial_out
+
+
+def test_jobs_negative(
+    capsys: pytest.CaptureFixture, main: MockMainType
+) -> None:
+    """Test a negative number of processes is rejected.
+
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    """
+    with pytest.raises(SystemExit):
+        main(".", long.jobs, "-1")
+
+    assert "--jobs: must be 0 or more" in capsys.readouterr().err
+
+
+def test_cache(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+) -> None:
+    """Test results are reused for unchanged files.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    """
+    template = templates.registered.getbyname("m-fail-s").template
+    file = init_file(template)  # type: ignore
+    assert main(".") == 1
+    expected = capsys.readouterr().out
+    monkeypatch.setattr(
+        "docsig._core._Module", lambda *_: pytest.fail("module parsed")
+    )
+    assert main(".") == 1
+    assert capsys.readouterr().out == expected
+    file.write_text(f"{template}\n")
+    with pytest.raises(pytest.fail.Exception):
+        main(".")
+
+
+def test_no_cache(tmp_path: Path, main: MockMainType) -> None:
+    """Test no cache is written with ``--no-cache``.
+
+    :param tmp_path: Create and return temporary directory.
+    :param main: Mock ``main`` function.
+    """
+    main(".", long.no_cache)
+    assert not (tmp_path / docsig._cache.CACHE_DIR).exists()
+
+
+def test_cache_evict(tmp_path: Path) -> None:
+    """Test least recently used entries are evicted first.
+
+    :param tmp_path: Create and return temporary directory.
+    """
+    cache = docsig._cache.Cache(tmp_path / "cache", maxsize=1024)
+    keys = [cache.key(str(i).encode()) for i in range(3)]
+    for index, key in enumerate(keys):
+        cache.set(key, 256 * "x")
+        os.utime(cache.path / key, (index, index))
+
+    assert cache.get(keys[0]) is not None
+    cache.set(cache.key(b"3"), 256 * "x")
+    cache.evict()
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+class _Planted:
+    def __reduce__(self) -> t.Tuple[t.Any, ...]:
+        return os.mkdir, ("planted",)
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        pickle.dumps(_Planted()),
+        b"[[1, [{}]]]",
+        b'{"fingerprint": {"lineno": 1}}',
+        b'[["file.py:", [{"lineno": "one"}]]]',
+        b"",
+    ],
+    ids=["pickle", "shape", "fingerprint", "type", "empty"],
+)
+def test_cache_untrusted(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+    entry: bytes,
+) -> None:
+    """Test entries which are not valid are treated as missing.
+
+    Entries are never unpickled, so code in an entry is never run.
+
+    :param tmp_path: Create and return temporary directory.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    :param entry: Contents of entry.
+    """
+    init_file(templates.registered.getbyname("m-fail-s").template)
+    assert main(".") == 1
+    expected = capsys.readouterr().out
+    for path in (tmp_path / docsig._cache.CACHE_DIR).glob("[!.]*"):
+        path.write_bytes(entry)
+
+    assert main(".") == 1
+    assert capsys.readouterr().out == expected
+    assert not (tmp_path / "planted").exists()
+
+
+def test_failures_sent() -> None:
+    """Test failures are the same when sent between processes, or cached."""
+    template = templates.registered.getbyname("m-fail-s").template
+    module = docsig._module._Module(template, [])  # type: ignore
+    results = docsig._core._check_module(
+        module, False, False, False, False, False, False, True, []
+    )
+    sent = pickle.loads(pickle.dumps(results))
+    cached = docsig._core._load_results(
+        json.loads(json.dumps(docsig._core._dump_results(results)))
+    )
+    for other in sent, cached:
+        assert [(k, [str(i.func_str) for i in v]) for k, v in other] == [
+            (k, [str(i.func_str) for i in v]) for k, v in results
+        ]
+        assert [(k, [i.report.get_report() for i in v]) for k, v in other] == [
+            (k, [i.report.get_report() for i in v]) for k, v in results
+        ]
+
+
+def test_cache_unwritable(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+) -> None:
+    """Test checks still succeed if the cache cannot be written.
+
+    :param tmp_path: Create and return temporary directory.
+    :param monkeypatch: Mock patch environment and attributes.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    """
+    init_file(templates.registered.getbyname("m-fail-s").template)
+    assert main(".", long.no_cache) == 1
+    expected = capsys.readouterr().out
+    cache = tmp_path / docsig._cache.CACHE_DIR
+    cache.write_text("")
+    assert main(".") == 1
+    assert capsys.readouterr().out == expected
+    cache.unlink()
+
+    def _raise(*_: t.Any, **__: t.Any) -> None:
+        raise PermissionError
+
+    replace = os.replace
+    monkeypatch.setattr("os.replace", _raise)
+    assert main(".") == 1
+    assert capsys.readouterr().out == expected
+    # only the .gitignore is left, without any temporary files
+    assert [i.name for i in cache.iterdir()] == [".gitignore"]
+    monkeypatch.setattr("os.replace", replace)
+    assert main(".") == 1
+    monkeypatch.setattr("os.utime", _raise)
+    monkeypatch.setattr("os.remove", _raise)
+    docsig._cache.Cache(maxsize=0).evict()
+    assert main(".") == 1
+    assert capsys.readouterr().out == expected * 2
+
+
+def test_report_streamed(
+    tmp_path: Path, capsys: pytest.CaptureFixture, main: MockMainType
+) -> None:
+    """Test failures are printed before later files are collected.
+
+    :param tmp_path: Create and return temporary directory.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    """
+    failing = tmp_path / "failing.py"
+    failing.write_text(
+        templates.registered.getbyname("m-fail-s").template  # type: ignore
+    )
+    with pytest.raises(FileNotFoundError):
+        main(failing, tmp_path / "does-not-exist")
+
+    assert "failing.py:2" in capsys.readouterr().out
+
+
+def test_modules_lazy() -> None:
+    """Test modules are not collected until they are iterated over."""
+    modules = docsig._module.Modules(Path("does-not-exist"), disable=[])
+    with pytest.raises(FileNotFoundError):
+        next(iter(modules))
+
+
+def test_modules_paths(init_file: InitFileFixtureType) -> None:
+    """Test modules are parsed from each file under the paths provided.
+
+    :param init_file: Initialize a test file.
+    """
+    init_file(templates.registered.getbyname("p-param-s").template)
+    modules = list(docsig._module.Modules(Path("."), disable=[]))
+    assert len(modules) == 1
+    assert [i.name for i in modules[0][0]] == ["function"]
+
+
+@pytest.mark.parametrize("check_overridden", [False, True])
+@pytest.mark.parametrize(
+    [NAME, TEMPLATE, "_"],
+    templates.registered,
+    ids=templates.registered.getids(),
+)
+def test_parsers_equal(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    name: str,
+    template: str,
+    _: str,
+    check_overridden: bool,
+) -> None:
+    """Test results are the same regardless of the parser used.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param capsys: Capture sys out.
+    :param name: Name of test.
+    :param template: Contents to check.
+    :param check_overridden: Check overridden methods.
+    """
+    kwargs = dict.fromkeys(
+        ["check_class", "check_dunders", "check_protected", "no_ansi"], True
+    )
+    expected = docsig.docsig(
+        string=template, check_overridden=check_overridden, **kwargs
+    )
+    std = capsys.readouterr()
+    monkeypatch.setattr(
+        docsig._node, "parse", lambda x, _: docsig._node.parse_astroid(x)
+    )
+    assert (
+        docsig.docsig(
+            string=template, check_overridden=check_overridden, **kwargs
+        )
+        == expected
+    ), name
+    assert capsys.readouterr().out == std.out
+
+
+OVERRIDDEN_RESOLVED = """
+import os
+import socket
+import subprocess
+
+
+class Base:
+    attr = 0
+    ann: int = 0
+    ann += 1
+    import sys
+    from os import path as p
+
+    class Inner:
+        pass
+
+    def method(self):
+        pass
+
+
+class Middle(Base, object):
+    pass
+
+
+class Child(Middle):
+    def method(self):
+        pass
+
+    def attr(self):
+        pass
+
+    def ann(self):
+        pass
+
+    def sys(self):
+        pass
+
+    def p(self):
+        pass
+
+    def Inner(self):
+        pass
+
+    def __eq__(self, other):
+        pass
+
+    def other(self):
+        pass
+"""
+
+OVERRIDDEN_UNRESOLVED = {
+    "attribute": """
+import os
+import socket
+import subprocess
+
+
+class Child(os.PathLike):
+    def method(self):
+        pass
+""",
+    "imported": """
+from os import PathLike as Base
+
+
+class Child(Base):
+    def method(self):
+        pass
+""",
+    "rebound": """
+class Base:
+    def method(self):
+        pass
+
+
+Base = object
+
+
+class Child(Base):
+    def method(self):
+        pass
+""",
+    "named-expr": """
+class Base:
+    (method := None)
+
+
+class Child(Base):
+    def method(self):
+        pass
+""",
+    "star-import": """
+class Base:
+    from os import *
+
+
+class Child(Base):
+    def method(self):
+        pass
+""",
+    "statement": """
+class Base:
+    if True:
+        def method(self):
+            pass
+
+
+class Child(Base):
+    def method(self):
+        pass
+""",
+    "ancestor": """
+import os
+import socket
+import subprocess
+
+
+class Base(os.PathLike):
+    pass
+
+
+class Child(Base):
+    def method(self):
+        pass
+""",
+}
+
+
+def _overridden(module: docsig._node.Module) -> t.List[t.Tuple[str, bool]]:
+    return [
+        (f"{i.name}.{j.name}", i.isoverridden(j.name))
+        for i in module.body
+        if isinstance(i, docsig._node.ClassDef)
+        for j in i.body
+    ]
+
+
+def test_overridden_resolved() -> None:
+    """Test overridden methods of local classes are found statically."""
+    module = docsig._node._parse_ast(ast.parse(OVERRIDDEN_RESOLVED), False)
+    assert module is not None
+    assert _overridden(module) == _overridden(
+        docsig._node.parse_astroid(OVERRIDDEN_RESOLVED)
+    )
+
+
+@pytest.mark.parametrize(
+    "string", OVERRIDDEN_UNRESOLVED.values(), ids=OVERRIDDEN_UNRESOLVED.keys()
+)
+def test_overridden_unresolved(string: str) -> None:
+    """Test inference is only used when overridden methods are needed.
+
+    :param string: Module which cannot be resolved without inference.
+    """
+    assert docsig._node._parse_ast(ast.parse(string), False) is None
+    assert docsig._node._parse_ast(ast.parse(string), True) is not None
+    assert _overridden(docsig._node.parse(string)) == _overridden(
+        docsig._node.parse_astroid(string)
+    )
+
+
+def test_parse_syntax_error() -> None:
+    """Test the same error is raised whichever parser is used."""
+    with pytest.raises(astroid.AstroidSyntaxError):
+        docsig._node.parse("def function(:")
+
+
+def test_docstring_cache(
+    main: MockMainType, init_file: InitFileFixtureType
+) -> None:
+    """Test identical docstrings are only converted once.
+
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    """
+    template = """
+def function_{}(param1) -> None:
+    '''Unique docstring for cache test.
+
+    :param param1: About param1.
+    '''
+"""
+    init_file("".join(template.format(i) for i in range(3)))
+    info = docsig._function.cache_info()
+    main(".", long.no_cache)
+    assert docsig._function.cache_info().misses == info.misses + 1
+    assert docsig._function.cache_info().hits == info.hits + 2
+
+
+@pytest.mark.parametrize(
+    [NAME, TEMPLATE, "_"],
+    templates.registered,
+    ids=templates.registered.getids(),
+)
+def test_docstring_styles_equal(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    name: str,
+    template: str,
+    _: str,
+) -> None:
+    """Test results are the same as if every docstring was converted.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param capsys: Capture sys out.
+    :param name: Name of test.
+    :param template: Contents to check.
+    """
+    kwargs = dict.fromkeys(
+        ["check_class", "check_dunders", "check_protected", "no_ansi"], True
+    )
+    expected = docsig.docsig(string=template, **kwargs)
+    std = capsys.readouterr()
+    monkeypatch.setattr(
+        docsig._function,
+        "_convert",
+        lambda x, _: docsig._function._NumpyDocstring(
+            docsig._function._GoogleDocstring(docsig._function._DocFmt(x))
+        ),
+    )
+    assert docsig.docsig(string=template, **kwargs) == expected, name
+    assert capsys.readouterr().out == std.out
+
+
+def test_docstring_style(
+    main: MockMainType, init_file: InitFileFixtureType
+) -> None:
+    """Test docstrings are only converted from the style set.
+
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    """
+    init_file(templates.registered.getbyname("p-param-g").template)
+    assert main(".", long.no_cache) == 0
+    assert main(".", long.no_cache, long.docstring_style, "google") == 0
+    assert main(".", long.no_cache, long.docstring_style, "sphinx") == 1
+
+
+def test_sphinx_not_imported(
+    monkeypatch: pytest.MonkeyPatch,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+) -> None:
+    """Test ``sphinx`` is not needed for docstrings in its own style.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    """
+    monkeypatch.setitem(sys.modules, "sphinx.ext.napoleon", None)
+    init_file(templates.registered.getbyname("p-param-s").template)
+    assert main(".", long.no_cache) == 0
+
+
+def test_ansi(capsys: pytest.CaptureFixture) -> None:
+    """Test failures are highlighted unless ANSI output is disabled.
+
+    :param capsys: Capture sys out.
+    """
+    template = templates.registered.getbyname("f-param-docs-s").template
+    assert docsig.docsig(string=template) == 1
+    assert "\x1b[" in capsys.readouterr().out
+
+
+def test_summary_not_rendered(
+    monkeypatch: pytest.MonkeyPatch,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+) -> None:
+    """Test functions are not rendered for a summarised report.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    """
+
+    def _render(_: docsig._display.FuncStr) -> None:
+        raise AssertionError("rendered")
+
+    monkeypatch.setattr(docsig._display.FuncStr, "_render", _render)
+    init_file(templates.registered.getbyname("f-param-docs-s").template)
+    assert main(".", long.summary) == 1
+
+
+DIFF_FUNCTION = """
+def function_{index}(param1, param2) -> None:
+    \"\"\"Function {index}.
+
+    :param param1: About param1.
+    \"\"\"
+"""
+
+
+def _git(*args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=docsig", "-c", "user.email=docsig@", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_diff(
+    tmp_path: Path, capsys: pytest.CaptureFixture, main: MockMainType
+) -> None:
+    """Test only functions changed since a git reference are checked.
+
+    :param tmp_path: Create and return temporary directory.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    """
+    committed = tmp_path / "committed.py"
+    changed = tmp_path / "package" / "changed.py"
+    untracked = tmp_path / "package" / "untracked.py"
+    changed.parent.mkdir()
+    committed.write_text(DIFF_FUNCTION.format(index=0))
+    changed.write_text("".join(DIFF_FUNCTION.format(index=i) for i in (1, 2)))
+    _git("init")
+    _git("add", ".")
+    _git("commit", "-m", "initial commit")
+    assert main(".", long.diff, "HEAD") == 0
+    changed.write_text(
+        changed.read_text().replace("Function 2.", "Function 2 changed.")
+    )
+    untracked.write_text(DIFF_FUNCTION.format(index=3))
+    assert main(".", long.diff, "HEAD") == 1
+    std = capsys.readouterr()
+    assert "function_0" not in std.out
+    assert "function_1" not in std.out
+    assert f"{Path('package') / 'changed.py'}:8" in std.out
+    assert f"{Path('package') / 'untracked.py'}:2" in std.out
+    assert main(changed, long.diff, "HEAD") == 1
+    assert "untracked.py" not in capsys.readouterr().out
+    assert main(".", long.diff, "HEAD", long.no_cache) == 1
+    assert main(".") == 1
+    assert "function_0" in capsys.readouterr().out
+
+
+def test_diff_removed(tmp_path: Path, main: MockMainType) -> None:
+    """Test functions which only have lines removed are changed.
+
+    :param tmp_path: Create and return temporary directory.
+    :param main: Mock ``main`` function.
+    """
+    file = tmp_path / "file.py"
+    file.write_text(
+        DIFF_FUNCTION.format(index=0).replace(
+            "    :param param1: About param1.\n",
+            "    :param param1: About param1.\n    :param param2: About.\n",
+        )
+    )
+    _git("init")
+    _git("add", ".")
+    _git("commit", "-m", "initial commit")
+    file.write_text(DIFF_FUNCTION.format(index=0))
+    assert main(".", long.diff, "HEAD") == 1
+
+
+def test_diff_errors(main: MockMainType) -> None:
+    """Test errors are raised for references and paths which do not exist.
+
+    :param main: Mock ``main`` function.
+    """
+    _git("init")
+    _git("commit", "--allow-empty", "-m", "initial commit")
+    with pytest.raises(subprocess.CalledProcessError):
+        main(".", long.diff, "does-not-exist")
+    with pytest.raises(FileNotFoundError):
+        main("does-not-exist", long.diff, "HEAD")
+
+
+def test_fingerprints(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+) -> None:
+    """Test only functions which have changed are checked again.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    """
+    checked = []
+    check_function = docsig._core._check_function
+    monkeypatch.setattr(
+        docsig._core,
+        "_check_function",
+        lambda x, *y: checked.append(x.name) or check_function(x, *y),
+    )
+    file = init_file("".join(DIFF_FUNCTION.format(index=i) for i in range(3)))
+    assert main(".") == 1
+    assert checked == ["function_0", "function_1", "function_2"]
+    checked.clear()
+    capsys.readouterr()
+    file.write_text(
+        "\n\n" + file.read_text().replace("Function 1.", "Function 1 changed.")
+    )
+    assert main(".") == 1
+    assert checked == ["function_1"]
+    std = capsys.readouterr()
+    assert main(".", long.no_cache) == 1
+    assert capsys.readouterr().out == std.out
+    assert "file.py:4" in std.out
+
+
+@pytest.mark.parametrize(
+    [NAME, TEMPLATE, "_"],
+    templates.registered,
+    ids=templates.registered.getids(),
+)
+def test_fingerprints_equal(
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+    name: str,
+    template: str,
+    _: str,
+) -> None:
+    """Test results are the same when reused for unchanged functions.
+
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    :param name: Name of test.
+    :param template: Contents to check.
+    """
+    args = ".", long.check_class, long.check_dunders, long.check_protected
+    file = init_file(template)
+    expected = main(*args)
+    std = capsys.readouterr()
+    file.write_text(f"{template}\n")
+    assert main(*args) == expected, name
+    assert capsys.readouterr().out == std.out
+
+
+def test_watch(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+) -> None:
+    """Test files are checked again when they change.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    """
+    file = init_file(templates.registered.getbyname("f-param-docs-s").template)
+
+    def _watch(*_: Path, **__: t.Any) -> t.Iterator[t.List[Path]]:
+        assert "file.py" in capsys.readouterr().out
+        file.write_text(templates.registered.getbyname("p-param-s").template)
+        yield [file]
+        assert capsys.readouterr().out == ""
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(docsig._core, "_watch", _watch)
+    assert main(".", long.watch) == 0
+
+
+def test_watch_diff(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    tmp_path: Path,
+    main: MockMainType,
+) -> None:
+    """Test only changes since a git reference are checked when watching.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param capsys: Capture sys out.
+    :param tmp_path: Create and return temporary directory.
+    :param main: Mock ``main`` function.
+    """
+    changed = tmp_path / "changed.py"
+    unchanged = tmp_path / "unchanged.py"
+    changed.write_text(DIFF_FUNCTION.format(index=0))
+    unchanged.write_text(DIFF_FUNCTION.format(index=1))
+    _git("init")
+    _git("add", ".")
+    _git("commit", "-m", "initial commit")
+
+    def _watch(*_: Path, **__: t.Any) -> t.Iterator[t.List[Path]]:
+        changed.write_text(DIFF_FUNCTION.format(index=2))
+        yield [Path("changed.py"), Path("unchanged.py")]
+
+    monkeypatch.setattr(docsig._core, "_watch", _watch)
+    assert main(".", long.watch, long.diff, "HEAD") == 1
+    std = capsys.readouterr()
+    assert "function_2" in std.out
+    assert "function_1" not in std.out
+
+
+def test_watch_poll(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test changes are found by polling.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param tmp_path: Create and return temporary directory.
+    """
+    file = tmp_path / "file.py"
+    file.write_text("")
+    watcher = docsig._watch._Poll(Path("."), interval=0)
+    os.utime(file, ns=(0, 0))
+    assert watcher.wait() == [Path("file.py")]
+    monkeypatch.setattr(
+        watcher._files, "find", lambda *_: iter([Path("removed.py")])
+    )
+    assert not watcher._take()
+
+
+@pytest.mark.skipif(
+    docsig._watch._libc() is None, reason="inotify is not available"
+)
+def test_watch_inotify(tmp_path: Path) -> None:
+    """Test changes are received from inotify.
+
+    :param tmp_path: Create and return temporary directory.
+    """
+    package = tmp_path / "package"
+    (package / "nested").mkdir(parents=True)
+    (package / "file.py").write_text("")
+    (package / "other.py").write_text("")
+    libc = docsig._watch._libc()
+    assert libc is not None
+    watcher = docsig._watch._Inotify(libc, Path("package"))
+    file_watcher = docsig._watch._Inotify(libc, Path("package") / "file.py")
+    (package / "file.py").write_text("changed")
+    (package / "other.py").write_text("changed")
+    (package / "file.txt").write_text("changed")
+    (package / "sub").mkdir()
+    (package / "sub" / "new.py").write_text("")
+    assert watcher.wait() == [
+        Path("package") / "file.py",
+        Path("package") / "other.py",
+        Path("package") / "sub" / "new.py",
+    ]
+    (package / "sub" / "new.py").write_text("changed")
+    (package / "nested" / "file.py").write_text("changed")
+    assert watcher.wait() == [
+        Path("package") / "sub" / "new.py",
+        Path("package") / "nested" / "file.py",
+    ]
+    assert file_watcher.wait() == [Path("package") / "file.py"]
+    watcher.close()
+    file_watcher.close()
+
+
+def test_watch_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test files are polled when inotify cannot be used.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+
+    def _inotify(*_: t.Any, **__: t.Any) -> None:
+        raise OSError
+
+    monkeypatch.setattr(docsig._watch, "_Inotify", _inotify)
+    monkeypatch.setattr(
+        docsig._watch._Poll, "wait", lambda _: [Path("file.py")]
+    )
+    watcher = docsig._watch.watch(Path("."))
+    assert next(watcher) == [Path("file.py")]
+    watcher.close()
+    monkeypatch.setattr(docsig._watch, "_libc", lambda: None)
+    watcher = docsig._watch.watch(Path("."))
+    assert next(watcher) == [Path("file.py")]
+    watcher.close()
+    with pytest.raises(FileNotFoundError):
+        next(docsig._watch.watch(Path("does-not-exist")))
+
+
+class _LibC:
+    def __init__(self, init: int, add_watch: int) -> None:
+        self._init = init
+        self._add_watch = add_watch
+
+    def inotify_init1(self, *_: t.Any) -> int:
+        return self._init
+
+    def inotify_add_watch(self, *_: t.Any) -> int:
+        return self._add_watch
+
+
+def test_watch_inotify_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test errors from inotify.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+    with pytest.raises(OSError):
+        docsig._watch._Inotify(_LibC(-1, -1), Path("."))  # type: ignore
+
+    read, write = os.pipe()
+    with pytest.raises(OSError):
+        docsig._watch._Inotify(_LibC(read, -1), Path("."))  # type: ignore
+
+    # closed when the watch could not be added
+    with pytest.raises(OSError):
+        os.close(read)
+
+    os.close(write)
+    read, write = os.pipe()
+    watcher = docsig._watch._Inotify(_LibC(read, 1), Path("."))  # type: ignore
+    name = b"file.py\0"
+    os.write(
+        write,
+        docsig._watch._EVENT.pack(
+            2, docsig._watch._IN_CLOSE_WRITE, 0, len(name)
+        )
+        + name,
+    )
+    changed: t.Dict[Path, None] = {}
+    watcher._read(changed)
+    assert not changed
+    watcher.close()
+    os.close(write)
+    monkeypatch.setattr(docsig._watch._sys, "platform", "darwin")
+    assert docsig._watch._libc() is None
+    monkeypatch.setattr(docsig._watch._sys, "platform", "linux")
+
+    def _cdll(*_: t.Any, **__: t.Any) -> None:
+        raise OSError
+
+    monkeypatch.setattr(docsig._watch._ctypes, "CDLL", _cdll)
+    assert docsig._watch._libc() is None
+
+
+@pytest.mark.parametrize("args", [[], [long.summary], [long.string, "x = 0"]])
+def test_daemon(
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+    daemon: Path,
+    args: t.List[str],
+) -> None:
+    """Test checking files with a daemon.
+
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    :param daemon: Run daemon in the background.
+    :param args: Commandline arguments.
+    """
+    init_file(templates.registered.getbyname("f-param-docs-s").template)
+    expected = main(".", *args)
+    std = capsys.readouterr()
+    assert main(".", long.client, *args) == expected
+    assert capsys.readouterr().out == std.out
+    assert daemon.exists()
+
+
+def test_daemon_errors(
+    monkeypatch: pytest.MonkeyPatch, main: MockMainType, daemon: Path
+) -> None:
+    """Test errors raised by a daemon are raised by its client.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param main: Mock ``main`` function.
+    :param daemon: Run daemon in the background.
+    """
+    with pytest.raises(FileNotFoundError, match="does-not-exist"):
+        main("does-not-exist", long.client)
+
+    class _Error(Exception):
+        pass
+
+    def _docsig(*_: t.Any, **__: t.Any) -> int:
+        raise _Error("message")
+
+    monkeypatch.setattr(docsig._core, "docsig", _docsig)
+    with pytest.raises(RuntimeError, match="message"):
+        main(".", long.client)
+
+    with pytest.raises(FileExistsError):
+        docsig._server.Server(daemon)
+
+    monkeypatch.setenv("DOCSIG_SOCKET", "not-listening.sock")
+    with pytest.raises(FileNotFoundError):
+        main(".", long.client)
+
+
+def test_daemon_main(
+    monkeypatch: pytest.MonkeyPatch, main: MockMainType
+) -> None:
+    """Test running the daemon until it is interrupted.
+
+    A socket left behind by a daemon that did not exit cleanly is
+    replaced.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param main: Mock ``main`` function.
+    """
+    path = Path("docsig.sock")
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.bind(str(path))
+
+    def _serve_forever(*_: t.Any) -> None:
+        assert path.exists()
+        raise KeyboardInterrupt
+
+    monkeypatch.setenv("DOCSIG_SOCKET", str(path))
+    monkeypatch.setattr(docsig._server.Server, "serve_forever", _serve_forever)
+    assert main(long.daemon) == 0
+    assert not path.exists()
+    monkeypatch.delenv("DOCSIG_SOCKET")
+    assert docsig._server.socket_path().parent == Path(tempfile.gettempdir())
+
+
+@pytest.mark.parametrize(
+    "args",
+    [[], [".", long.client, long.watch], [".", long.client, long.daemon]],
+    ids=["no-path", "client-watch", "client-daemon"],
+)
+def test_daemon_args(main: MockMainType, args: t.List[str]) -> None:
+    """Test invalid combinations of arguments.
+
+    :param main: Mock ``main`` function.
+    :param args: Commandline arguments.
+    """
+    with pytest.raises(SystemExit):
+        main(*args)
+
+
+def _lsp_messages(*messages: t.Dict[str, t.Any]) -> bytes:
+    content = b""
+    for message in messages:
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        content += b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+    return content
+
+
+def _lsp_read(content: bytes) -> t.List[t.Dict[str, t.Any]]:
+    fin = io.BytesIO(content)
+    messages = []
+    while True:
+        message = docsig._lsp._read(fin)  # type: ignore
+        if message is None:
+            return messages
+
+        messages.append(message)
+
+
+def _lsp_server(fin: t.BinaryIO, fout: t.BinaryIO) -> docsig._lsp.Server:
+    return docsig._lsp.Server(
+        fin,
+        fout,
+        disable=[],
+        ignore_args=False,
+        ignore_kwargs=False,
+        docstring_style=None,
+        check_class=False,
+        check_dunders=False,
+        check_overridden=False,
+        check_protected=False,
+        check_property_returns=False,
+        ignore_no_params=False,
+        no_ansi=True,
+        targets=[],
+    )
+
+
+def _did_open(uri: str, text: str) -> t.Dict[str, t.Any]:
+    return {
+        "method": "textDocument/didOpen",
+        "params": {
+            "textDocument": {
+                "uri": uri,
+                "languageId": "python",
+                "version": 1,
+                "text": text,
+            }
+        },
+    }
+
+
+def _did_change(uri: str, *changes: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+    return {
+        "method": "textDocument/didChange",
+        "params": {"textDocument": {"uri": uri}, "contentChanges": changes},
+    }
+
+
+def _diagnostics(uri: str, *codes: str) -> t.Dict[str, t.Any]:
+    return {"uri": uri, "codes": list(codes)}
+
+
+def _published(messages: t.List[t.Dict[str, t.Any]]) -> t.List[t.Any]:
+    return [
+        _diagnostics(
+            i["params"]["uri"],
+            *[d["code"] for d in i["params"]["diagnostics"]],
+        )
+        for i in messages
+        if i.get("method") == "textDocument/publishDiagnostics"
+    ]
+
+
+def test_lsp(monkeypatch: pytest.MonkeyPatch, main: MockMainType) -> None:
+    """Test checking documents with the language server.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param main: Mock ``main`` function.
+    """
+    uri = "file:///module/file.py"
+    content = _lsp_messages(
+        {"id": 1, "method": "initialize", "params": {}},
+        {"method": "initialized", "params": {}},
+        _did_open(
+            uri, templates.registered.getbyname("f-param-docs-s").template
+        ),
+        _did_change(
+            uri,
+            {
+                "range": {
+                    "start": {"line": 1, "character": 27},
+                    "end": {"line": 1, "character": 27},
+                },
+                "text": ", param3",
+            },
+        ),
+        {
+            "method": "textDocument/didSave",
+            "params": {"textDocument": {"uri": uri}},
+        },
+        {
+            "method": "textDocument/didSave",
+            "params": {"textDocument": {"uri": uri}},
+        },
+        _did_change(uri, {"text": "def function(:\n"}),
+        {
+            "method": "textDocument/didSave",
+            "params": {"textDocument": {"uri": uri}},
+        },
+        {"id": 2, "method": "textDocument/hover", "params": {}},
+        {"method": "$/cancelRequest", "params": {"id": 2}},
+        {"id": 3, "result": None},
+        {
+            "method": "textDocument/didClose",
+            "params": {"textDocument": {"uri": uri}},
+        },
+        {"id": 4, "method": "shutdown"},
+        {"method": "exit"},
+    )
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(content)))
+    monkeypatch.setattr("sys.stdout", stdout)
+    assert main(long.lsp) == 0
+    messages = _lsp_read(stdout.buffer.getvalue())  # type: ignore
+    assert messages[0]["id"] == 1
+    assert messages[0]["result"]["capabilities"]["textDocumentSync"]
+    assert _published(messages) == [
+        _diagnostics(uri, "E102"),
+        _diagnostics(uri),
+        _diagnostics(uri),
+    ]
+    assert [i["error"]["code"] for i in messages if i.get("id") == 2] == [
+        -32601
+    ]
+    assert messages[-1] == {"jsonrpc": "2.0", "id": 4, "result": None}
+
+
+def test_lsp_exit() -> None:
+    """Test exit status of language server which was not shut down."""
+    fout = io.BytesIO()
+    assert (
+        _lsp_server(
+            io.BytesIO(_lsp_messages({"method": "exit"})), fout
+        ).serve()
+        == 1
+    )
+    assert _lsp_server(io.BytesIO(), fout).serve() == 1
+    assert not fout.getvalue()
+
+
+def test_lsp_debounce(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test documents are checked once they stop changing.
+
+    Only functions which have changed are checked again.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+    checked = []
+    check_function = docsig._core._check_function
+
+    def _check_function(func: t.Any, *args: t.Any) -> t.Any:
+        checked.append(func.name)
+        return check_function(func, *args)
+
+    monkeypatch.setattr(docsig._core, "_check_function", _check_function)
+    first = "file:///first.py"
+    second = "file:///second.py"
+    text = templates.registered.getbyname(
+        "f-param-docs-s"
+    ).template + templates.registered.getbyname("p-param-s").template.replace(
+        "function", "other"
+    )
+    change = {
+        "range": {
+            "start": {"line": 1, "character": 27},
+            "end": {"line": 1, "character": 27},
+        },
+        "text": ", param3",
+    }
+    read, write = os.pipe()
+    os.write(
+        write,
+        _lsp_messages(
+            _did_open(first, text),
+            _did_open(second, text),
+            _did_change(first, change),
+            _did_change(second, change),
+        ),
+    )
+
+    def _exit() -> None:
+        os.write(write, _lsp_messages({"method": "exit"}))
+        os.close(write)
+
+    timer = threading.Timer(docsig._lsp.DEBOUNCE * 10, _exit)
+    timer.start()
+    fout = io.BytesIO()
+    with os.fdopen(read, "rb") as fin:
+        assert _lsp_server(fin, fout).serve() == 1
+
+    timer.join()
+    assert _published(_lsp_read(fout.getvalue())) == [
+        _diagnostics(first, "E102"),
+        _diagnostics(second, "E102"),
+        _diagnostics(first),
+        _diagnostics(second),
+    ]
+    assert checked == ["function", "other"] * 2 + ["function"] * 2
+
+
+@pytest.mark.parametrize(
+    "text,change,expected",
+    [
+        ("a\nb", {"text": "c"}, "c"),
+        (
+            "a\r\nb\rc\x0cd\ne",
+            {
+                "range": {
+                    "start": {"line": 2, "character": 2},
+                    "end": {"line": 3, "character": 0},
+                },
+                "text": "f",
+            },
+            "a\r\nb\rc\x0cfe",
+        ),
+        (
+            "x = '\U0001f600'\ny",
+            {
+                "range": {
+                    "start": {"line": 0, "character": 7},
+                    "end": {"line": 0, "character": 8},
+                },
+                "text": "",
+            },
+            "x = '\U0001f600\ny",
+        ),
+        (
+            "a\nb",
+            {
+                "range": {
+                    "start": {"line": 1, "character": 9},
+                    "end": {"line": 5, "character": 0},
+                },
+                "text": "c",
+            },
+            "a\nbc",
+        ),
+    ],
+    ids=["full", "line-endings", "utf-16", "out-of-range"],
+)
+def test_lsp_apply(
+    text: str, change: t.Dict[str, t.Any], expected: str
+) -> None:
+    """Test changes to documents are applied.
+
+    :param text: Text of the document.
+    :param change: Change to apply.
+    :param expected: Expected text of the document.
+    """
+    assert docsig._lsp._apply(text, change) == expected
+
+
+def test_lsp_hints() -> None:
+    """Test hints are added to the errors they belong to."""
+    report = ["E109: cannot determine", "hint: it is possible", "E101: order"]
+    failure = docsig._display.Failure(
+        3, "function", None, None, report  # type: ignore
+    )
+    diagnostics = docsig._lsp._diagnostics(failure)
+    assert [(i["code"], i["message"]) for i in diagnostics] == [
+        ("E109", "cannot determine\nhint: it is possible"),
+        ("E101", "order"),
+    ]
+    assert diagnostics[0]["range"]["start"] == {"line": 2, "character": 0}
+
+
+@pytest.mark.parametrize(
+    [NAME, TEMPLATE, "_"],
+    templates.registered,
+    ids=templates.registered.getids(),
+)
+def test_check_equal(
+    capsys: pytest.CaptureFixture, name: str, template: str, _: str
+) -> None:
+    """Test results are the same as what is reported.
+
+    :param capsys: Capture sys out.
+    :param name: Name of test.
+    :param template: Contents to write to file.
+    :param _: Unused expected result.
+    """
+    kwargs = {
+        "string": template,
+        "check_class": True,
+        "check_dunders": True,
+        "check_overridden": True,
+        "check_protected": True,
+        "check_property_returns": True,
+        "ignore_no_params": "-i-" in name,
+    }
+    status = docsig.docsig(no_ansi=True, summary=True, **kwargs)
+    std = capsys.readouterr()
+    results = docsig.check(**kwargs)
+    assert int(bool(results)) == status
+    assert std.out == "".join(
+        "{} in {}\n\t{}\n".format(
+            i.lineno,
+            i.name if i.parent_name is None else f"{i.parent_name}.{i.name}",
+            "\n\t".join(i.messages),
+        )
+        for i in results
+    )
+    for result in results:
+        assert result.path is None
+        assert result.codes == tuple(
+            i[:4] for i in result.messages if not i.startswith("hint")
+        )
+
+
+def test_check(init_file: InitFileFixtureType) -> None:
+    """Test results of functions in files which failed their checks.
+
+    :param init_file: Initialize a test file.
+    """
+    init_file(
+        templates.registered.getbyname("f-param-docs-s").template
+        + "\n\nclass Klass:\n"
+        + textwrap.indent(
+            templates.registered.getbyname("f-param-docs-s").template, "    "
+        ).replace("(param1", "(self, param1")
+    )
+    results = docsig.check(Path("."), no_cache=True)
+    assert results == [
+        docsig.Result(
+            Path("module") / "file.py",
+            2,
+            None,
+            "function",
+            ("E102",),
+            (docsig.messages.E102,),
+        ),
+        docsig.Result(
+            Path("module") / "file.py",
+            13,
+            "Klass",
+            "function",
+            ("E102",),
+            (docsig.messages.E102,),
+        ),
+    ]
+    assert isinstance(results, docsig.Results)
+    assert docsig.check(Path("."), disable=["E102"]) == []
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "json", "sarif"])
+def test_format(
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+    output_format: str,
+) -> None:
+    """Test writing failures in a format instead of the report.
+
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    :param output_format: Format to write.
+    """
+    init_file(
+        templates.registered.getbyname("f-param-docs-s").template
+        + templates.registered.getbyname("f-hint-missing-return-s").template
+        + templates.registered.getbyname("f-property-returns-s").template
+    )
+    results = docsig.check(Path("."), check_property_returns=True)
+    assert len(results) == 3
+    expected = [json.loads(json.dumps(i.as_json())) for i in results]
+    assert main(".", long.format, output_format, long.check_property_returns)
+    out = capsys.readouterr().out
+    if output_format == "jsonl":
+        assert [json.loads(i) for i in out.splitlines()] == expected
+    elif output_format == "json":
+        assert json.loads(out) == expected
+    else:
+        sarif = json.loads(out)
+        assert sarif["version"] == "2.1.0"
+        run = sarif["runs"][0]
+        assert run["tool"]["driver"]["name"] == "docsig"
+        assert [
+            (
+                i["ruleId"],
+                i["message"]["text"],
+                i["locations"][0]["physicalLocation"]["region"]["startLine"],
+                i["locations"][0]["logicalLocations"][0]["fullyQualifiedName"],
+            )
+            for i in run["results"]
+        ] == [
+            (
+                code,
+                text,
+                i.lineno,
+                i.name
+                if i.parent_name is None
+                else f"{i.parent_name}.{i.name}",
+            )
+            for i in results
+            for code, text in i.errors
+        ]
+        assert {i["ruleId"] for i in run["results"]} <= {
+            i["id"] for i in run["tool"]["driver"]["rules"]
+        }
+
+
+@pytest.mark.parametrize(
+    "output_format,expected",
+    [("jsonl", ""), ("json", "[]\n"), ("sarif", '"results": []}]}\n')],
+    ids=["jsonl", "json", "sarif"],
+)
+def test_format_passed(
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+    init_file: InitFileFixtureType,
+    output_format: str,
+    expected: str,
+) -> None:
+    """Test writing formats when all checks pass.
+
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    :param init_file: Initialize a test file.
+    :param output_format: Format to write.
+    :param expected: Expected end of output.
+    """
+    init_file(templates.registered.getbyname("p-param-s").template)
+    assert main(".", long.format, output_format) == 0
+    assert capsys.readouterr().out.endswith(expected)
+
+
+def test_format_string(capsys: pytest.CaptureFixture) -> None:
+    """Test checked strings have no location in SARIF.
+
+    :param capsys: Capture sys out.
+    """
+    docsig.docsig(
+        string=templates.registered.getbyname("f-param-docs-s").template,
+        output_format="sarif",
+    )
+    results = json.loads(capsys.readouterr().out)["runs"][0]["results"]
+    assert "physicalLocation" not in results[0]["locations"][0]
+
+
+@pytest.mark.parametrize(
+    "name,template,_", templates.registered, ids=templates.registered.getids()
+)
+def test_skipped_checks(
+    monkeypatch: pytest.MonkeyPatch, name: str, template: str, _: str
+) -> None:
+    """Test skipping checks for errors which cannot be reported.
+
+    Results need to be the same as if every check was run.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param name: Name of test.
+    :param template: Contents to write to file.
+    :param _: Unused expected result.
+    """
+    options = [{"targets": [i]} for i in docsig._directives.ERRORS] + [
+        {"targets": ["E101", "E113"]},
+        {"disable": ["E110", "E112"]},
+        {"targets": ["E101", "E112"], "disable": ["E112"]},
+    ]
+    kwargs = {
+        "string": template,
+        "check_class": True,
+        "check_dunders": True,
+        "check_overridden": True,
+        "check_protected": True,
+        "check_property_returns": True,
+        "ignore_no_params": "-i-" in name,
+    }
+    skipped = [docsig.check(**kwargs, **i) for i in options]
+    monkeypatch.setattr(docsig._report.Report, "enabled", lambda *_: True)
+    assert skipped == [docsig.check(**kwargs, **i) for i in options]
+
+
+def test_skipped_docstrings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test docstrings are not parsed when no errors need them.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+    monkeypatch.setattr(docsig._function, "_RawDocstring", None)
+    results = docsig.check(
+        string=templates.registered.getbyname("f-param-docs-s").template
+        + "\n\ndef function(param) -> None:\n    pass\n",
+        targets=["E113"],
+    )
+    assert [i.codes for i in results] == [("E113",)]
+
+
+def test_skipped_signatures(
+    monkeypatch: pytest.MonkeyPatch, init_file: InitFileFixtureType
+) -> None:
+    """Test signatures are not collected when no errors need them.
+
+    Only functions which fail need their signature, to display it.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    :param init_file: Initialize a test file.
+    """
+    init_file(templates.registered.getbyname("f-param-docs-s").template)
+    monkeypatch.setattr(docsig._function, "_Signature", None)
+    monkeypatch.setattr(docsig._function, "_RawDocstring", None)
+    assert not docsig.check(Path("."), targets=["E113"])
+    assert not docsig.check(Path("."), targets=["E113", "E114"])
+
+
+@pytest.mark.parametrize("mini,maxi", [(0.8, 1.0), (0.0, 1.0), (0.5, 0.9)])
+def test_almost_equal(mini: float, maxi: float) -> None:
+    """Test strings ruled out early are the same as if compared.
+
+    :param mini: Minimum difference allowed between two strings.
+    :param maxi: Maximum difference allowed to be considered almost
+        equal.
+    """
+    names = ["", "a", "ab", "ba", "param", "parma", "params", "aaab", "abbb"]
+    names += ["param1", "param_1", "kwargs", "kwrags", "args", "arg"]
+    for i in names:
+        for j in names:
+            assert docsig._utils.almost_equal(i, j, mini, maxi) is (
+                mini < difflib.SequenceMatcher(a=i, b=j).ratio() < maxi
+            )
+
+
+def test_directives_lines() -> None:
+    """Test directives are only stored for lines where they change."""
+    function = "def function_{}(param) -> None:\n    pass\n"
+    string = "\n".join(
+        [
+            "# docsig: disable=E101",
+            *[function.format(i) for i in range(5000)],
+            "def continued(param) \\\n        -> None:\n    pass\n",
+            "# docsig: enable",
+            function.format("enabled"),
+            "def inline():  # docsig: disable=E102\n    pass\n",
+        ]
+    )
+    directives = docsig._directives.Directives(string, ["E105"])
+    lines = string.splitlines()
+    disabled = {
+        i.split("(")[0][4:]: directives.get(n)[1]
+        for n, i in enumerate(lines, 1)
+        if i.startswith("def ")
+    }
+    assert (
+        disabled["function_0"] == disabled["function_4999"] == {"E101", "E105"}
+    )
+    assert disabled["function_enabled"] == set()
+    assert disabled["inline"] == {"E102"}
+    assert disabled["continued"] == {"E101", "E105"}
+    assert len(directives._lines) == 3
+    assert len(directives._inline) == 1
+
+
+def test_directives_skipped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test code without directives is not tokenized.
+
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+    monkeypatch.setattr(docsig._directives._tokenize, "generate_tokens", None)
+    string = "def function(param) \\\n        -> None:\n    pass\n"
+    directives = docsig._directives.Directives(string, ["E105"])
+    assert directives.get(1) == ([], {"E105"})
+    results = docsig.check(string=string, disable=["E113"])
+    assert not results
+
+
+def test_fingerprint_hash_seed() -> None:
+    """Test fingerprints of functions are the same in every process.
+
+    The order of disabled errors depends on the hash seed, so it is not
+    part of the fingerprint.
+    """
+    code = (
+        "import docsig._module;"
+        "print(next(iter(docsig._module._Module("
+        "'def f(a): pass', ['E101', 'E102', 'E103', 'E113']"
+        ")[0])).fingerprint)"
+    )
+    assert (
+        len(
+            {
+                subprocess.run(
+                    [sys.executable, "-c", code],
+                    # the package may not be installed
+                    env={
+                        **os.environ,
+                        "PYTHONHASHSEED": str(i),
+                        "PYTHONPATH": str(Path(docsig.__file__).parents[1]),
+                    },
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                ).stdout
+                for i in range(4)
+            }
+        )
+        == 1
+    )
+
+
+def _tree(root: Path, *paths: str) -> None:
+    # create each file, with a function which fails its checks
+    for path in paths:
+        file = root / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(DIFF_FUNCTION.format(index=0))
+
+
+def test_files(tmp_path: Path, main: MockMainType) -> None:
+    """Test files are found in sorted order, without excluded paths.
+
+    :param tmp_path: Create and return temporary directory.
+    :param main: Mock ``main`` function.
+    """
+    _tree(
+        tmp_path,
+        "b.py",
+        "a.py",
+        "a/c.py",
+        "a/b/file.py",
+        ".venv/lib/file.py",
+        "build/file.py",
+        "src/build.py",
+        "src/stub.pyi",
+        "src/file.txt",
+    )
+    (tmp_path / "src" / "link.py").symlink_to(tmp_path / "missing.py")
+    files = docsig._files.Files()
+    assert list(files.find(Path("."))) == [
+        Path(".venv/lib/file.py"),
+        Path("a/b/file.py"),
+        Path("a/c.py"),
+        Path("a.py"),
+        Path("b.py"),
+        Path("build/file.py"),
+        Path("src/build.py"),
+    ]
+    files = docsig._files.Files([".venv", "build/", "a/b"], ["*.py*"])
+    assert list(files.find(Path("."), Path("build/file.py"))) == [
+        Path("a/c.py"),
+        Path("a.py"),
+        Path("b.py"),
+        Path("src/build.py"),
+        Path("src/stub.pyi"),
+    ]
+    assert list(files.find(Path("a/b/file.py"), Path("a/b"))) == []
+    results = docsig.check(
+        Path("."), exclude=[".venv", "a", "build"], include=["b*.py"]
+    )
+    assert [i.path for i in results] == [Path("b.py"), Path("src/build.py")]
+    assert main(".", long.exclude, "*.py", long.include, "*.py") == 0
+
+
+@pytest.mark.parametrize(
+    "glob,path,expected",
+    [
+        ("*.py", "a/file.py", True),
+        ("a/*.py", "a/file.py", True),
+        ("a/*.py", "a/b/file.py", False),
+        ("a/**/*.py", "a/file.py", True),
+        ("a/**/*.py", "a/b/c/file.py", True),
+        ("**/b", "a/b/file.py", True),
+        ("a/**", "a/b/file.py", True),
+        ("/file.py", "file.py", True),
+        ("/file.py", "a/file.py", False),
+        ("fil?.py", "file.py", True),
+        ("fil[a-f].py", "file.py", True),
+        ("fil[!a-f].py", "file.py", False),
+        ("[file.py", "[file.py", True),
+        ("\\[file].py", "[file].py", True),
+        ("# file.py", "# file.py", False),
+        ("\\#file.py", "#file.py", True),
+        ("", "file.py", False),
+    ],
+)
+def test_files_globs(glob: str, path: str, expected: bool) -> None:
+    """Test globs match paths the same way as those of git.
+
+    :param glob: Glob to exclude.
+    :param path: Path to match.
+    :param expected: Whether the path is expected to be excluded.
+    """
+    files = docsig._files.Files([glob], ["*"])
+    assert files.accepts(Path(path)) is not expected
+
+
+def test_files_gitignore(tmp_path: Path, main: MockMainType) -> None:
+    """Test files ignored by git are excluded.
+
+    :param tmp_path: Create and return temporary directory.
+    :param main: Mock ``main`` function.
+    """
+    _tree(
+        tmp_path,
+        "build/file.py",
+        "docs/conf.py",
+        "docs/keep.py",
+        "docs/sub/conf.py",
+        "src/file.py",
+        "src/generated.py",
+        "src/package/generated.py",
+        "file.py",
+    )
+    files = docsig._files.Files(gitignore=True)
+    expected = list(files.find(Path(".")))
+    (tmp_path / ".gitignore").write_text(
+        "# comment\n\nbuild/\n/docs/*.py\n!docs/keep.py\n"
+    )
+    (tmp_path / "src" / ".gitignore").write_text("generated.py\n")
+    (tmp_path / "src" / "package" / ".gitignore").write_text("!generated.py\n")
+    # rules only apply within a git repository
+    assert list(files.find(Path("."))) == expected
+    (tmp_path / ".git").mkdir()
+    assert list(files.find(Path("."))) == [
+        Path("docs/keep.py"),
+        Path("docs/sub/conf.py"),
+        Path("file.py"),
+        Path("src/file.py"),
+        Path("src/package/generated.py"),
+    ]
+    assert list(files.find(Path("src"), Path("build/file.py"))) == [
+        Path("src/file.py"),
+        Path("src/package/generated.py"),
+    ]
+    assert list(files.find(tmp_path / "docs")) == [
+        tmp_path / "docs" / "keep.py",
+        tmp_path / "docs" / "sub" / "conf.py",
+    ]
+    assert not files.accepts(Path("build/file.py"))
+    assert files.accepts(Path("src/package/generated.py"))
+    assert main(".", long.gitignore, long.exclude, "file.py,keep.py") == 1
+    assert main(".", long.gitignore, long.exclude, "*.py") == 0
+
+
+def test_files_diff(
+    tmp_path: Path, capsys: pytest.CaptureFixture, main: MockMainType
+) -> None:
+    """Test excluded files are not checked, even if they changed.
+
+    :param tmp_path: Create and return temporary directory.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    """
+    _tree(tmp_path, "build/file.py", "src/file.py")
+    _git("init")
+    _git("add", ".")
+    _git("commit", "-m", "initial commit")
+    assert docsig._files.Files(gitignore=True).accepts(Path("src/file.py"))
+    for path in ("build/file.py", "src/file.py"):
+        (tmp_path / path).write_text(DIFF_FUNCTION.format(index=1))
+
+    assert main(".", long.diff, "HEAD", long.exclude, "build") == 1
+    std = capsys.readouterr()
+    assert "src/file.py" in std.out
+    assert "build/file.py" not in std.out
+
+
+def test_files_watch(tmp_path: Path) -> None:
+    """Test excluded files, and directories, are not watched.
+
+    :param tmp_path: Create and return temporary directory.
+    """
+    _tree(tmp_path, "build/file.py", "src/file.py", "src/build.py")
+    files = docsig._files.Files(["build"])
+    libc = docsig._watch._libc()
+    assert libc is not None
+    watcher = docsig._watch._Inotify(libc, Path("."), files=files)
+    assert Path("build") not in watcher._dirs.values()
+    poll = docsig._watch._Poll(Path("."), files=files, interval=0)
+    for path in ("build/file.py", "src/file.py", "src/build.py"):
+        (tmp_path / path).write_text("changed")
+        os.utime(tmp_path / path, ns=(0, 0))
+
+    expected = [Path("src/build.py"), Path("src/file.py")]
+    assert sorted(watcher.wait()) == expected
+    assert sorted(poll.wait()) == expected
+    watcher.close()
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        (b'"""Module."""\n', '"""Module."""\n'),
+        (b'\xef\xbb\xbf"""Module."""\n', '"""Module."""\n'),
+        (
+            b'# -*- coding: latin-1 -*-\n"""Module \xe9."""\n',
+            '# -*- coding: latin-1 -*-\n"""Module \xe9."""\n',
+        ),
+        (
+            b'#!/usr/bin/env python\n# coding=cp1252\n"""\x93Module\x94."""',
+            '#!/usr/bin/env python\n# coding=cp1252\n"""“Module”."""',
+        ),
+        (b'"""Module."""\r\n\r\nx = 1\r', '"""Module."""\n\nx = 1\n'),
+        (b"", ""),
+    ],
+    ids=["utf-8", "bom", "cookie", "second-line", "newlines", "empty"],
+)
+def test_decode(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    source: bytes,
+    expected: str,
+) -> None:
+    """Test files are decoded as Python decodes them.
+
+    :param tmp_path: Create and return temporary directory.
+    :param monkeypatch: Mock patch environment and attributes.
+    :param source: Contents of file.
+    :param expected: Expected decoded contents.
+    """
+    file = tmp_path / "file.py"
+    file.write_bytes(source)
+    assert docsig._files.decode(docsig._files.read(file)) == expected
+    monkeypatch.setattr("docsig._files.MMAP_SIZE", 1)
+    buffer = docsig._files.read(file)
+    assert isinstance(buffer, mmap.mmap) is bool(source)
+    assert docsig._files.decode(buffer) == expected
+
+
+def test_decode_check(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    main: MockMainType,
+) -> None:
+    """Test files are checked the same however they are read.
+
+    :param tmp_path: Create and return temporary directory.
+    :param monkeypatch: Mock patch environment and attributes.
+    :param capsys: Capture sys out.
+    :param main: Mock ``main`` function.
+    """
+    function = DIFF_FUNCTION.format(index=0).replace("Function", "Fonction é")
+    (tmp_path / "utf.py").write_text(function, encoding="utf-8")
+    (tmp_path / "latin.py").write_bytes(
+        f"# coding: latin-1\n{function}".encode("latin-1")
+    )
+    assert main(".", long.no_ansi, long.no_cache) == 1
+    expected = capsys.readouterr().out
+    assert "latin.py:" in expected
+    monkeypatch.setattr("docsig._files.MMAP_SIZE", 1)
+    # files are read by each worker when checked in parallel, which is
+    # run in threads here so it is covered
+    monkeypatch.setattr(
+        "concurrent.futures.ProcessPoolExecutor",
+        concurrent.futures.ThreadPoolExecutor,
+    )
+    for args in ((long.no_cache,), (long.jobs, "2", long.no_cache), (), ()):
+        # results of mapped files are cached, and reused, the same
+        assert main(".", long.no_ansi, *args) == 1
+        assert capsys.readouterr().out == expected
+
+
+def test_prefetch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test files are read in order, and only a few ahead of time.
+
+    :param tmp_path: Create and return temporary directory.
+    :param monkeypatch: Mock patch environment and attributes.
+    """
+    paths = [tmp_path / f"{i}.py" for i in range(10)]
+    for index, path in enumerate(paths):
+        path.write_text(str(index))
+
+    found: t.List[Path] = []
+
+    def _paths() -> t.Iterator[Path]:
+        for path in paths:
+            found.append(path)
+            yield path
+
+    prefetched = docsig._files.prefetch(_paths(), workers=2)
+    assert next(prefetched) == (paths[0], b"0")
+    assert found == paths[:3]
+    assert (
+        list(prefetched)
+        == [(p, str(i).encode()) for i, p in enumerate(paths)][1:]
+    )
+    paths[5].unlink()
+    with pytest.raises(FileNotFoundError):
+        list(docsig._files.prefetch(paths))